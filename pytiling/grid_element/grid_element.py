@@ -140,12 +140,9 @@ class GridElement:
     @property
     def is_on_edge(self) -> bool:
         """Returns True if the tile is on an edge, False otherwise."""
-        return (
-            self.position[0] == 0
-            or self.position[0] == self.layer.size[0] - 1
-            or self.position[1] == 0
-            or self.position[1] == self.layer.size[1] - 1
-        )
+        x, y = self.position
+        width, height = self.layer.size
+        return x == 0 or x == width - 1 or y == 0 or y == height - 1
 
 
 def unique_elements(elements: Iterable["GridElement | None"]) -> list["GridElement"]:
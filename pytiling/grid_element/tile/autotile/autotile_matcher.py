@@ -0,0 +1,89 @@
+"""Vectorized autotile rule matching over whole grids of packed neighborhoods."""
+
+import warnings
+from functools import lru_cache
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from .autotile_rule import AutotileRule
+
+RuleTable = tuple[np.ndarray, np.ndarray]
+
+# Bit of each cell of a 3x3 neighborhood, row by row. The center has no bit.
+NEIGHBOR_BITS = np.array([[0, 1, 2], [3, -1, 4], [5, 6, 7]], dtype=np.int8)
+# The value each cell adds to a neighborhood mask (0 for the center).
+NEIGHBOR_WEIGHTS = np.where(
+    NEIGHBOR_BITS >= 0, 1 << NEIGHBOR_BITS.clip(0).astype(np.uint16), 0
+).astype(np.uint16)
+FULL_NEIGHBOR_MASK = 0xFF
+
+
+@lru_cache(maxsize=256)
+def build_rule_table(rules: tuple["AutotileRule", ...]) -> RuleTable:
+    """
+    Resolve a rule list for all 256 possible neighborhoods at once.
+    - Displays: a (256, 2) array with the display of the first rule matching each neighborhood mask.
+    - Matched: a (256,) bool array telling whether any rule matched that mask at all.
+
+    Neighborhood masks are packed as in ``neighbor_bits_grid``.
+    """
+    weights = NEIGHBOR_WEIGHTS
+    masks = np.arange(256, dtype=np.uint16)
+    displays = np.zeros((256, 2), dtype=np.int16)
+    matched = np.zeros(256, dtype=bool)
+
+    for rule in rules:
+        if rule.rule_matrix.shape != (3, 3):
+            raise ValueError(
+                f"Only 3x3 rule matrices can be packed, got {rule.rule_matrix.shape}"
+            )
+        relevant = weights[rule.empty_mask | rule.filled_mask].sum()
+        required = weights[rule.filled_mask].sum()
+
+        newly_matched = ~matched & ((masks & relevant) == required)
+        displays[newly_matched] = rule.display
+        matched |= newly_matched
+        if matched.all():
+            break
+
+    return displays, matched
+
+
+def neighbor_mask(neighbors_bool_grid: np.ndarray) -> int:
+    """Pack a 3x3 neighbor bool grid into the mask ``neighbor_bits_grid`` gives its center cell."""
+    if neighbors_bool_grid.shape != (3, 3):
+        raise ValueError(
+            f"Only 3x3 neighbor grids can be packed, got {neighbors_bool_grid.shape}"
+        )
+    return int(NEIGHBOR_WEIGHTS[neighbors_bool_grid].sum())
+
+
+def neighbor_bits_grid(occupied: np.ndarray) -> np.ndarray:
+    """
+    Pack the eight neighbors of every cell of an occupancy grid into a uint8.
+    The bit of each neighbor is given by ``NEIGHBOR_BITS`` (row by row, skipping the center),
+    and it is set when the neighbor is occupied or out of the grid, matching
+    ``TilemapLayerNeighborProcessor.get_neighbors_bool_grid``.
+    """
+    height, width = occupied.shape
+    padded = np.ones((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = occupied
+
+    bits = np.zeros((height, width), dtype=np.uint8)
+    for (y, x), bit in np.ndenumerate(NEIGHBOR_BITS):
+        if bit < 0:
+            continue
+        bits |= padded[y : y + height, x : x + width].astype(np.uint8) << np.uint8(bit)
+    return bits
+
+
+def match_rules(bits: np.ndarray, rule_table: RuleTable) -> np.ndarray:
+    """
+    Return the display of the first rule matching each packed neighborhood, as an array of
+    shape ``bits.shape + (2,)``. Neighborhoods no rule matches get ``(0, 0)``.
+    """
+    displays, matched = rule_table
+    if not matched[bits].all():
+        warnings.warn("No display found", UserWarning)
+    return displays[bits]
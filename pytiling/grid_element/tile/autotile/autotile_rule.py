@@ -13,6 +13,8 @@ class AutotileRule:
     - Display: a tuple of two integers representing the x and y coordinates of the tile's display in the layer's tileset.
     """
 
+    __slots__ = ("rule_matrix", "display", "empty_mask", "filled_mask")
+
     display: tuple[int, int]
 
     def __init__(
@@ -20,8 +22,19 @@ class AutotileRule:
         rule_matrix: list[list[int]],
         display: tuple[int, int],
     ):
-        self.rule_matrix = np.array(rule_matrix)
-        self.display = display
+        self.rule_matrix = np.ascontiguousarray(rule_matrix, dtype=np.int8)
+        self.display = (int(display[0]), int(display[1]))
+
+        # Cells that must be empty (0) or filled (3) for the rule to match.
+        self.empty_mask = self.rule_matrix == 0
+        self.filled_mask = self.rule_matrix == 3
+
+    def matches(self, neighbors_bool_grid: np.ndarray) -> bool:
+        """Check whether a neighbor bool grid satisfies this rule."""
+        return not (
+            (neighbors_bool_grid & self.empty_mask).any()
+            or (self.filled_mask & ~neighbors_bool_grid).any()
+        )
 
 
 def get_rule_group(
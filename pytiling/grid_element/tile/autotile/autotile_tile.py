@@ -1,8 +1,9 @@
 from .. import Tile
 import warnings
-from typing import TYPE_CHECKING, cast, TypedDict
-import os
+from typing import TYPE_CHECKING, TypedDict
+import numpy as np
 from blinker import Signal
+from .autotile_matcher import build_rule_table, neighbor_mask
 
 if TYPE_CHECKING:
     from .autotile_rule import AutotileRule
@@ -18,6 +19,8 @@ class Variation(TypedDict):
 class AutotileTile(Tile):
     """A class representing an autotile tile. It extends the Tile class and adds the ability to change its display based on the rules it has. Each rule defines a specific display based on the tile's neighbors."""
 
+    is_autotile = True
+
     def __init__(
         self,
         position: tuple[int, int],
@@ -58,7 +61,6 @@ class AutotileTile(Tile):
     @layer.setter
     def layer(self, layer: "GridLayer"):
         """Set the tile's layer."""
-        layer = cast("TilemapLayer", layer)
         self._layer = layer
 
     @property
@@ -67,28 +69,33 @@ class AutotileTile(Tile):
 
     def format(self):
         """Format the tile's display. Return True if the tile's display has changed."""
+        neighbor_processor = self.neighbor_processor
+        rules = self.layer.autotile_rules[self.name]
+        if neighbor_processor.adjacency_rule != "eight":
+            # Only eight-adjacency neighborhoods can be packed straight from the id grids.
+            display = AutotileTile.display_from_neighbor_grid(
+                neighbor_processor.get_neighbors_bool_grid(self), rules
+            )
+        else:
+            display = AutotileTile.display_from_neighbor_mask(
+                neighbor_processor.get_neighbors_mask(self), rules
+            )
+
+        return self.format_with_display(display)
+
+    def format_with_display(self, display: tuple[int, int]):
+        """Format the tile using an autotile display that was already matched, e.g. by a batch match over the whole layer. Return True if the tile's display has changed."""
         previous_display = self.display
 
-        neighbors_bool_grid = self.neighbor_processor.get_neighbors_bool_grid(self)
-
-        display_changed = self._autotile_calculate(neighbors_bool_grid)
+        # Reset the tile's variations, as the autotile-assigned display overrides any variation previously set.
+        self.reset_variations()
+        self.display = display
         self.events["post_autotile"].send(tile=self)
 
         super().format()
 
         return self.display != previous_display
 
-    def _autotile_calculate(self, neighbors_bool_grid):
-        """Change the tile's display based on the rules it has. Returns True if the tile's display has changed, or False otherwise."""
-        # Reset the tile's variations, as the autotile-assigned display overrides any variation previously set.
-        self.reset_variations()
-
-        previous_display = self.display
-        self.display = AutotileTile.display_from_neighbor_grid(
-            neighbors_bool_grid, self.layer.autotile_rules[self.name]
-        )
-        return self.display != previous_display
-
     @staticmethod
     def display_from_neighbor_grid(
         neighbors_bool_grid, rules: list["AutotileRule"]
@@ -99,39 +106,42 @@ class AutotileTile(Tile):
         without placing tiles on the map.
         """
 
-        def find_display(rule_index: int):
-            if rule_index >= len(rules):
-                warnings.warn("No display found", UserWarning)
-                return (0, 0)
-            rule = rules[rule_index]
-
-            for y, row in enumerate(rule.rule_matrix):
-                for x, cell in enumerate(row):
-                    if cell == 1:
-                        continue
-                    if cell == 2:
-                        continue
-
-                    neighbor_exists = neighbors_bool_grid[y, x]
-                    if (neighbor_exists and cell == 0) or (
-                        (not neighbor_exists) and cell == 3
-                    ):
-                        return find_display(rule_index + 1)
-
-            return rule.display
+        neighbors_bool_grid = np.asarray(neighbors_bool_grid, dtype=bool)
+        return AutotileTile.display_from_neighbor_mask(
+            neighbor_mask(neighbors_bool_grid), rules
+        )
 
-        return find_display(0)
+    @staticmethod
+    def display_from_neighbor_mask(
+        mask: int, rules: list["AutotileRule"]
+    ) -> tuple[int, int]:
+        """Pick a tileset display for a packed neighborhood (see ``neighbor_bits_grid``). The rules are resolved for all 256 neighborhoods once, so this is a single lookup."""
+        displays, matched = build_rule_table(tuple(rules))
+        if not matched[mask]:
+            warnings.warn("No display found", UserWarning)
+
+        display_x, display_y = displays[mask].tolist()
+        return (display_x, display_y)
+
+    def _neighbor_amounts(self) -> tuple[int, int]:
+        """Return the amount of neighbors within radius 1 and within radius 2, both taken from a single radius-2 scan."""
+        neighbor_processor = self.neighbor_processor
+        neighbors = neighbor_processor.get_neighbors_bool_grid(
+            self, radius=2, out=neighbor_processor.scratch_bool_grid(radius=2)
+        )
+        return (
+            int(np.count_nonzero(neighbors[1:-1, 1:-1])),
+            int(np.count_nonzero(neighbors)),
+        )
 
     @property
     def is_deep(self):
-        return self.neighbor_processor.get_amount_of_neighbors_of(self, radius=2) == 24
+        return self._neighbor_amounts()[1] == 24
 
     @property
     def is_shallow(self):
-        return (
-            self.neighbor_processor.get_amount_of_neighbors_of(self, radius=1) == 8
-            and not self.is_deep
-        )
+        near_amount, amount = self._neighbor_amounts()
+        return near_amount == 8 and amount != 24
 
     @property
     def is_border(self):
@@ -1,3 +1,9 @@
-from .detailed import detailed_default_autotile_rules
+from .detailed import get_detailed_default_autotile_rules
 
-__all__ = ["detailed_default_autotile_rules"]
+__all__ = ["get_detailed_default_autotile_rules", "detailed_default_autotile_rules"]
+
+
+def __getattr__(name: str):
+    if name == "detailed_default_autotile_rules":
+        return get_detailed_default_autotile_rules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
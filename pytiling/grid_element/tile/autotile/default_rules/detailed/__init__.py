@@ -1,3 +1,9 @@
-from .detailed_rules import detailed_rules as detailed_default_autotile_rules
+from .detailed_rules import get_detailed_rules as get_detailed_default_autotile_rules
 
-__all__ = ["detailed_default_autotile_rules"]
+__all__ = ["get_detailed_default_autotile_rules", "detailed_default_autotile_rules"]
+
+
+def __getattr__(name: str):
+    if name == "detailed_default_autotile_rules":
+        return get_detailed_default_autotile_rules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
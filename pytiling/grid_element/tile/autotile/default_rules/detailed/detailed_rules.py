@@ -1,4 +1,5 @@
 import os
+from functools import cache
 from ...rule_factory import create_autotile_rules_from_json
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -6,8 +7,17 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 forms_path = os.path.join(script_dir, "detailed_autotile_forms.json")
 rules_definition_path = os.path.join(script_dir, "detailed_rules.json")
 
-# Generate the detailed_rules list dynamically
-detailed_rules = create_autotile_rules_from_json(
-    forms_path=forms_path,
-    rules_path=rules_definition_path,
-)
+
+@cache
+def get_detailed_rules():
+    """Generate the detailed rules list from its JSON definitions. The rules are only built on first use, so importing pytiling doesn't pay for them."""
+    return create_autotile_rules_from_json(
+        forms_path=forms_path,
+        rules_path=rules_definition_path,
+    )
+
+
+def __getattr__(name: str):
+    if name == "detailed_rules":
+        return get_detailed_rules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
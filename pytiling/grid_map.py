@@ -1,8 +1,11 @@
+from itertools import permutations
+import numpy as np
 from .utils import Direction, direction_vectors
 from typing import TYPE_CHECKING, Literal, Sequence, Union, Callable, cast
 from blinker import Signal
 
 if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
     from .layer import GridLayer
     from .grid_element import GridElement
 
@@ -18,6 +21,7 @@ class GridMap:
         min_grid_size: tuple[int, int],
         max_grid_size: tuple[int, int],
     ):
+        self._size: tuple[int, int] | None = None
         self.tile_size = tile_size
         self.min_grid_size = min_grid_size
         self.max_grid_size = max_grid_size
@@ -98,7 +102,7 @@ class GridMap:
                     layer.add_concurrent_layer(concurrent_layer)
 
     def on_layer_event(self, event_name: str, callback: Callable):
-        for layer in self.layers:
+        for layer in self._layers:
             layer.events[event_name].connect(callback, weak=True)
 
     def add_layer(self, layer: "GridLayer", position: int | Literal["end"] = "end"):
@@ -121,12 +125,26 @@ class GridMap:
         )
 
     @property
-    def size(self):
-        tile_width, tile_height = self.tile_size
-        return (
-            self.grid_size[0] * tile_width,
-            self.grid_size[1] * tile_height,
-        )
+    def tile_size(self) -> tuple[int, int]:
+        """Get the size of each tile in pixels."""
+        return self._tile_size
+
+    @tile_size.setter
+    def tile_size(self, value: tuple[int, int]):
+        """Set the size of each tile in pixels."""
+        self._tile_size = value
+        self._size = None
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Get the size of the map in pixels. Cached until the tile size or grid size changes."""
+        if self._size is None:
+            tile_width, tile_height = self._tile_size
+            self._size = (
+                self._grid_size[0] * tile_width,
+                self._grid_size[1] * tile_height,
+            )
+        return self._size
 
     @property
     def grid_size(self) -> tuple[int, int]:
@@ -137,10 +155,12 @@ class GridMap:
     def grid_size(self, value: tuple[int, int]):
         """Set the size of the tilemap. Note that this won't resize the layers."""
         self._grid_size = self.clamp_size(value)
+        self._size = None
 
     def resize(self, size: tuple[int, int]):
         """Set the size of the tilemap. This will resize all layers to match."""
         self._grid_size = size
+        self._size = None
         for layer in self._layers:
             layer.resize(size)
 
@@ -268,7 +288,7 @@ class GridMap:
     def all_elements(self) -> list["GridElement"]:
         """Get a list of all elements in the grid map."""
         elements: list["GridElement"] = []
-        for layer in self.layers:
+        for layer in self._layers:
             elements.extend(layer.elements)
         return elements
 
@@ -278,7 +298,7 @@ class GridMap:
 
     def all_elements_at(self, position: tuple[int, int]):
         elements: list["GridElement"] = []
-        for layer in self.layers:
+        for layer in self._layers:
             element = layer.get_element_at(position)
             if element:
                 elements.append(element)
@@ -286,59 +306,89 @@ class GridMap:
 
     def add_layer_concurrence(self, *layer_names: str):
         """Make the specified layers concurrent. Tiles from concurrent layers won't be able to be placed on the same position. So the addition of a tile on a layer will remove the tiles at the same position from its concurrent layers."""
-        layers = [self.get_layer(name) for name in layer_names]
+        # A layer named twice would otherwise be paired with itself.
+        layers = list(dict.fromkeys(self.get_layer(name) for name in layer_names))
 
-        for layer in layers:
-            other_layers = [l for l in layers if l is not layer]
-            for other_layer in other_layers:
-                layer.add_concurrent_layer(other_layer)
+        for layer, other_layer in permutations(layers, 2):
+            layer.add_concurrent_layer(other_layer)
 
     def position_is_valid(self, position: tuple[int, int]):
-        return (
-            position[0] >= 0
-            and position[1] >= 0
-            and position[0] < self.grid_size[0]
-            and position[1] < self.grid_size[1]
-        )
+        x, y = position
+        width, height = self._grid_size
+        return 0 <= x < width and 0 <= y < height
 
     def for_grid_position(self, callback: Callable[[tuple[int, int]], None]):
         """Loops over each grid position in the layer's grid, calling the given callback."""
-        for x in range(self.grid_size[0]):
-            for y in range(self.grid_size[1]):
+        width, height = self._grid_size
+        for x in range(width):
+            for y in range(height):
                 callback((x, y))
 
     def grid_pos_to_actual_pos(
         self, position: tuple[int, int], invert_x_axis=False, invert_y_axis=True
     ) -> tuple[float, float]:
         """Convert a tile position in the layer to an actual position in the window."""
-        tile_width, tile_height = self.tile_size
-        map_width, map_height = self.size
+        tile_width, tile_height = self._tile_size
+        if invert_y_axis and not invert_x_axis:
+            # The default orientation, and by far the most common call.
+            return (position[0] * tile_width, self.size[1] - position[1] * tile_height)
+
         pos = [position[0] * tile_width, position[1] * tile_height]
 
         if invert_x_axis:
-            pos[0] = map_width - pos[0]
+            pos[0] = self.size[0] - pos[0]
         if invert_y_axis:
-            pos[1] = map_height - pos[1]
+            pos[1] = self.size[1] - pos[1]
 
         return (pos[0], pos[1])
 
+    def grid_pos_to_actual_pos_batch(
+        self, positions: "ArrayLike", invert_x_axis=False, invert_y_axis=True
+    ) -> np.ndarray:
+        """Convert many tile positions at once. Takes an array of shape (N, 2) and returns one of the same shape, each row being what grid_pos_to_actual_pos returns for it."""
+        actual_positions = np.asarray(positions).reshape(-1, 2) * np.asarray(
+            self._tile_size
+        )
+        map_width, map_height = self.size
+
+        if invert_x_axis:
+            actual_positions[:, 0] = map_width - actual_positions[:, 0]
+        if invert_y_axis:
+            actual_positions[:, 1] = map_height - actual_positions[:, 1]
+
+        return actual_positions
+
     def actual_pos_to_grid_pos(
         self, position: tuple[float, float], invert_x_axis=False, invert_y_axis=True
     ):
         """Convert an actual position in the window to a tile position in the layer."""
-        tile_width, tile_height = self.tile_size
+        tile_width, tile_height = self._tile_size
+        x, y = position
+        # The map size is only needed to flip an axis.
+        if invert_x_axis:
+            x = self.size[0] - x
+        if invert_y_axis:
+            y = self.size[1] - y
+
+        return (int(x // tile_width), int(y // tile_height + 1))
+
+    def actual_pos_to_grid_pos_batch(
+        self, positions: "ArrayLike", invert_x_axis=False, invert_y_axis=True
+    ) -> np.ndarray:
+        """Convert many actual positions at once. Takes an array of shape (N, 2) and returns an integer one of the same shape, each row being what actual_pos_to_grid_pos returns for it."""
+        actual_positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
         map_width, map_height = self.size
-        pos: list[int] = [
-            int(position[0] // tile_width),
-            int(position[1] // tile_height + 1),
-        ]
 
         if invert_x_axis:
-            pos[0] = int((map_width - position[0]) // tile_width)
+            actual_positions[:, 0] = map_width - actual_positions[:, 0]
         if invert_y_axis:
-            pos[1] = int((map_height - position[1]) // tile_height + 1)
+            actual_positions[:, 1] = map_height - actual_positions[:, 1]
 
-        return (*pos,)
+        grid_positions = (actual_positions // np.asarray(self._tile_size)).astype(
+            np.int64
+        )
+        grid_positions[:, 1] += 1
+        return grid_positions
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -347,6 +397,9 @@ class GridMap:
         return state
 
     def __setstate__(self, state):
+        if "tile_size" in state:
+            state["_tile_size"] = state.pop("tile_size")
+        state["_size"] = None
         self.__dict__.update(state)
 
         self._restart_events()
@@ -1,26 +1,40 @@
-from typing import TypedDict, Callable
+from typing import NamedTuple, Callable
 import numpy as np
 from .layer_checker import LayerChecker
 from functools import cached_property
 from pytiling.utils import (
     reduce_grid_towards,
     expand_grid_towards,
+    resize_grid,
     Direction,
     opposite_directions,
     direction_vectors,
 )
-from typing import TYPE_CHECKING, Literal, Union, cast
+from typing import TYPE_CHECKING, Literal, Union
 from blinker import Signal
 from pytiling.grid_element import unique_elements
 
 if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
     from ..grid_map import GridMap
     from pytiling.grid_element import GridElement
 
 
-class Area(TypedDict):
-    top_left: tuple[int, int]
-    bottom_right: tuple[int, int]
+class Area(NamedTuple):
+    """A rectangle of grid cells. All four bounds are inclusive."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+    @property
+    def top_left(self) -> tuple[int, int]:
+        return (self.left, self.top)
+
+    @property
+    def bottom_right(self) -> tuple[int, int]:
+        return (self.right, self.bottom)
 
 
 class GridLayer:
@@ -30,6 +44,7 @@ class GridLayer:
         self._tile_size: tuple[int, int] | None = None
         self._grid_map: "GridMap | None" = None
         self._grid: np.ndarray | None = None
+        self._size: tuple[int, int] | None = None
 
         self.checker = LayerChecker(self)
 
@@ -88,7 +103,11 @@ class GridLayer:
     def initialize_grid(self, size: tuple[int, int]):
         """Initialize the grid of the layer."""
         if self._grid is None:
-            self._grid = np.empty((size[1], size[0]), dtype=object)
+            self.grid = np.empty((size[1], size[0]), dtype=object)
+
+    def _set_cell(self, position: tuple[int, int], element: "GridElement | None"):
+        """Write a single cell of the grid. Every cell write goes through here, so subclasses can keep per-cell data in sync."""
+        self.grid[position[1], position[0]] = element
 
     def add_element(self, element: "GridElement"):
         """Add an element to the layer's grid, claiming its full footprint."""
@@ -96,6 +115,12 @@ class GridLayer:
         for position in footprint:
             self.checker.check_position(position)
 
+        return self._add_element(element, footprint)
+
+    def _add_element(
+        self, element: "GridElement", footprint: list[tuple[int, int]]
+    ) -> bool:
+        """Add an element whose footprint positions were already checked to be inside the grid."""
         same_layer_elements = self._elements_in_footprint(footprint)
         for same_layer_element in same_layer_elements:
             if same_layer_element.locked:
@@ -121,7 +146,7 @@ class GridLayer:
 
         element.layer = self
         for position in footprint:
-            self.grid[position[1], position[0]] = element
+            self._set_cell(position, element)
 
         self.events["element_created"].send(element=element)
 
@@ -149,10 +174,12 @@ class GridLayer:
         between this method and remove_element resides in the sent event: while this
         sends a generic element_removed event, remove_element sends a element_directly_removed event.
         """
+        grid = self.grid
+        height, width = grid.shape
         for position in element.footprint_positions():
-            if self.checker.position_is_valid(position):
-                if self.grid[position[1], position[0]] is element:
-                    self.grid[position[1], position[0]] = None
+            x, y = position
+            if 0 <= x < width and 0 <= y < height and grid[y, x] is element:
+                self._set_cell(position, None)
 
         self.events["element_removed"].send(element=element, layer_name=self.name)
 
@@ -191,6 +218,13 @@ class GridLayer:
             position, invert_x_axis, invert_y_axis
         )
 
+    def grid_pos_to_actual_pos_batch(
+        self, positions: "ArrayLike", invert_x_axis=False, invert_y_axis=True
+    ) -> np.ndarray:
+        return self.grid_map.grid_pos_to_actual_pos_batch(
+            positions, invert_x_axis, invert_y_axis
+        )
+
     def actual_pos_to_grid_pos(
         self, position: tuple[float, float], invert_x_axis=False, invert_y_axis=True
     ):
@@ -198,6 +232,28 @@ class GridLayer:
             position, invert_x_axis, invert_y_axis
         )
 
+    def actual_pos_to_grid_pos_batch(
+        self, positions: "ArrayLike", invert_x_axis=False, invert_y_axis=True
+    ) -> np.ndarray:
+        return self.grid_map.actual_pos_to_grid_pos_batch(
+            positions, invert_x_axis, invert_y_axis
+        )
+
+    def get_area_around(self, position: tuple[int, int], radius: int) -> Area:
+        """Get the area of cells within the given radius of a position, clipped to the grid."""
+        x, y = position
+        return self.clip_area(x - radius, y - radius, x + radius, y + radius)
+
+    def clip_area(self, left: int, top: int, right: int, bottom: int) -> Area:
+        """Build an area from its bounds, clipped to the grid. All four bounds are inclusive, so an exclusive right or bottom bound has to be passed minus one. The result may be empty (right < left or bottom < top) if the bounds miss the grid."""
+        height, width = self.grid.shape
+        return Area(
+            left if left > 0 else 0,
+            top if top > 0 else 0,
+            right if right < width else width - 1,
+            bottom if bottom < height else height - 1,
+        )
+
     @property
     def grid_map(self) -> "GridMap":
         """Get the grid_map of the layer."""
@@ -227,14 +283,16 @@ class GridLayer:
     def tile_size(self, tile_size: tuple[int, int]):
         """Set the tile size of the layer."""
         self._tile_size = tile_size
+        self._size = None
 
     @property
-    def size(self):
-        tile_width, tile_height = self.tile_size
-        return (
-            self.grid_size[0] * tile_width,
-            self.grid_size[1] * tile_height,
-        )
+    def size(self) -> tuple[int, int]:
+        """Get the size of the layer in pixels. Cached until the tile size or the grid changes."""
+        if self._size is None:
+            tile_width, tile_height = self.tile_size
+            grid_width, grid_height = self.grid_size
+            self._size = (grid_width * tile_width, grid_height * tile_height)
+        return self._size
 
     @property
     def grid(self) -> np.ndarray:
@@ -250,15 +308,17 @@ class GridLayer:
     def grid(self, grid: np.ndarray):
         """Set the grid of the layer."""
         self._grid = grid
+        self._size = None
 
     @property
     def grid_size(self) -> tuple[int, int]:
         """Get the size of the grid."""
-        return (self.grid.shape[1], self.grid.shape[0])
+        height, width = self.grid.shape
+        return (width, height)
 
     def resize(self, size: tuple[int, int]):
-        """Set the size of the grid."""
-        self.grid = np.resize(self.grid, size)
+        """Set the size of the grid. Elements keep their positions; cells beyond the new size are dropped and new cells are empty."""
+        self.grid = resize_grid(self.grid, size)
 
     def for_all_elements(self, callback: Callable):
         """Loops over each unique element in the layer's grid, calling the given callback."""
@@ -305,11 +365,13 @@ class GridLayer:
     def shift_elements_towards(self, direction: Direction, size: int):
         """Shift elements in the specified direction and rewrite footprint occupancy."""
         elements = self.elements
+        grid = self.grid
+        height, width = grid.shape
         for element in elements:
             for position in element.footprint_positions():
-                if self.checker.position_is_valid(position):
-                    if self.grid[position[1], position[0]] is element:
-                        self.grid[position[1], position[0]] = None
+                x, y = position
+                if 0 <= x < width and 0 <= y < height and grid[y, x] is element:
+                    self._set_cell(position, None)
 
         dx, dy = direction_vectors[direction]
         for element in elements:
@@ -318,7 +380,7 @@ class GridLayer:
                 element.position[1] + dy * size,
             )
             for position in element.footprint_positions():
-                self.grid[position[1], position[0]] = element
+                self._set_cell(position, element)
 
     def get_edge_elements(
         self, edge: Union[Direction, Literal["all"]] = "all", size=1, retreat=0
@@ -326,16 +388,19 @@ class GridLayer:
         """Get a set of elements on specified edges of the layer's grid, ensuring no duplicates at corners."""
         edge_elements: "list[GridElement | None]" = []
 
+        get_element_at = self.get_element_at
         for pos in self.grid_map.get_edge_positions(edge, size, retreat=retreat):
-            element = self.get_element_at(pos)
-            edge_elements.append(element)
+            edge_elements.append(get_element_at(pos))
 
         return edge_elements
 
-    def get_element_at(self, position: tuple[int, int]):
+    def get_element_at(self, position: tuple[int, int]) -> "GridElement | None":
         """Get an element at a given position, or None if there is no element at that position."""
-        if self.checker.position_is_valid(position):
-            return cast("GridElement", self.grid[position[1], position[0]])
+        grid = self.grid
+        height, width = grid.shape
+        x, y = position
+        if 0 <= x < width and 0 <= y < height:
+            return grid[y, x]
         return None
 
     @property
@@ -364,6 +429,7 @@ class GridLayer:
         return state
 
     def __setstate__(self, state):
+        state["_size"] = None
         self.__dict__.update(state)
 
         self._restart_events()
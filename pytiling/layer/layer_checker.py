@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
+import numpy as np
 
 if TYPE_CHECKING:
     from .grid_layer import GridLayer
@@ -21,10 +22,25 @@ class LayerChecker:
                 f"Position {position} is not valid, because it is out of bounds for the grid {self.layer.grid_size}."
             )
 
-    def position_is_valid(self, position: tuple[int, int]):
-        return (
-            position[0] >= 0
-            and position[1] >= 0
-            and position[0] < self.layer.grid_size[0]
-            and position[1] < self.layer.grid_size[1]
+    def check_positions(self, positions: "Sequence[tuple[int, int] | None]"):
+        """Check many positions at once. The bounds are checked in a single NumPy pass, and the error raised is the one check_position would raise for the first invalid position."""
+        if any(position is None for position in positions):
+            self.check_position(None)
+        if not positions:
+            return
+
+        positions_array = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        width, height = self.layer.grid_size
+        invalid = (
+            (positions_array < 0).any(axis=1)
+            | (positions_array[:, 0] >= width)
+            | (positions_array[:, 1] >= height)
         )
+        if invalid.any():
+            first_invalid = positions_array[np.argmax(invalid)].tolist()
+            self.check_position((first_invalid[0], first_invalid[1]))
+
+    def position_is_valid(self, position: tuple[int, int]):
+        x, y = position
+        height, width = self.layer.grid.shape
+        return 0 <= x < width and 0 <= y < height
@@ -1,10 +1,17 @@
-from typing import Union, cast, TYPE_CHECKING, Literal
+from typing import Union, cast, TYPE_CHECKING, Literal, Iterable
+import numpy as np
 from pytiling.tileset.tileset import Tileset
 from .tilemap_layer_formatter import TilemapLayerFormatter
-from ..grid_layer import GridLayer
+from ..grid_layer import GridLayer, Area
 from .tilemap_layer_neighbor_processor import TilemapLayerNeighborProcessor
 from functools import cached_property
-from pytiling.utils import Direction
+from pytiling.utils import (
+    Direction,
+    expand_grid_towards,
+    reduce_grid_towards,
+    resize_grid,
+)
+from pytiling.grid_element import unique_elements
 from pytiling.grid_element.tile import Tile
 from pytiling.grid_element.tile.attached import AttachedTile
 from pytiling.grid_element.tile.autotile import (
@@ -12,16 +19,26 @@ from pytiling.grid_element.tile.autotile import (
     AutotileRule,
 )
 from pytiling.grid_element.tile.autotile.default_rules import (
-    detailed_default_autotile_rules,
+    get_detailed_default_autotile_rules,
 )
 from blinker import Signal
 
 if TYPE_CHECKING:
     from grid_element.tile.autotile import AutotileRule
+    from pytiling.grid_element import GridElement
+
+# Name ids are stored in autotile_ids, whose int16 cells must hold every one of them.
+MAX_NAME_ID = np.iinfo(np.int16).max
 
 
 class TilemapLayer(GridLayer):
-    """A class representing a tilemap layer. It contains a grid of tiles."""
+    """
+    A class representing a tilemap layer. It contains a grid of tiles.
+    Next to the object grid, the layer keeps two integer grids with the same shape, so
+    occupancy queries can run over contiguous memory instead of Python objects:
+    - tile_ids (int32): the interned name id of the tile on each cell, or -1 if the cell is empty.
+    - autotile_ids (int16): the same id, but only for autotile tiles (-1 on any other cell).
+    """
 
     autotile_rules: dict[str, list["AutotileRule"]]
 
@@ -39,8 +56,9 @@ class TilemapLayer(GridLayer):
         self.tileset = tileset
 
         if isinstance(autotile_rules, str):
+            # The default rules are built once and shared, so each layer gets its own list.
             self.autotile_rules = {
-                "default": self._get_default_autotile_rules(autotile_rules)
+                "default": list(self._get_default_autotile_rules(autotile_rules))
             }
         else:
             self.autotile_rules = autotile_rules
@@ -49,11 +67,17 @@ class TilemapLayer(GridLayer):
 
         self.formatter = TilemapLayerFormatter(self)
 
+        self._name_ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self.tile_ids = np.full((0, 0), -1, dtype=np.int32)
+        self.autotile_ids = np.full((0, 0), -1, dtype=np.int16)
+
         self._restart_events()
 
     def _get_default_autotile_rules(self, rules_type: Literal["detailed"]):
         if rules_type == "detailed":
-            return detailed_default_autotile_rules
+            return get_detailed_default_autotile_rules()
+        raise ValueError(f"Unknown default autotile rules: {rules_type}")
 
     def _restart_events(self):
         super()._restart_events()
@@ -62,6 +86,73 @@ class TilemapLayer(GridLayer):
             "tile_formatted": Signal(),
         }
 
+    def initialize_grid(self, size: tuple[int, int]):
+        super().initialize_grid(size)
+        if self.tile_ids.shape != self.grid.shape:
+            self._rebuild_ids()
+
+    def name_id(self, name: str) -> int:
+        """Get the id a tile name is interned as in tile_ids and autotile_ids. Raises ValueError if a new name would get an id that doesn't fit in autotile_ids."""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._name_ids)
+            if name_id > MAX_NAME_ID:
+                raise ValueError(
+                    f"Too many tile names in layer {self.name}: at most {MAX_NAME_ID + 1} are supported."
+                )
+            self._name_ids[name] = name_id
+            self._names.append(name)
+        return name_id
+
+    def find_name_id(self, name: str) -> int | None:
+        """Get the id a tile name is interned as, or None if no tile of that name was ever on the layer. Unlike name_id, an unknown name isn't interned."""
+        return self._name_ids.get(name)
+
+    def name_for_id(self, name_id: int) -> str:
+        """Get the tile name interned as the given id. Raises KeyError if no name has that id."""
+        if not 0 <= name_id < len(self._names):
+            raise KeyError(f"No tile name has id {name_id} in layer {self.name}.")
+        return self._names[name_id]
+
+    def _set_cell(self, position: tuple[int, int], element: "GridElement | None"):
+        super()._set_cell(position, element)
+        self._set_ids(position, element)
+
+    def _set_ids(self, position: tuple[int, int], element: "GridElement | None"):
+        x, y = position
+        if element is None:
+            self.tile_ids[y, x] = -1
+            self.autotile_ids[y, x] = -1
+            return
+
+        name_id = self.name_id(element.name)
+        self.tile_ids[y, x] = name_id
+        self.autotile_ids[y, x] = name_id if element.is_autotile else -1  # type: ignore
+
+    def _rebuild_ids(self):
+        """Recompute tile_ids and autotile_ids from the object grid."""
+        self.tile_ids = np.full(self.grid.shape, -1, dtype=np.int32)
+        self.autotile_ids = np.full(self.grid.shape, -1, dtype=np.int16)
+        for y, x in zip(*np.nonzero(self.grid != None)):
+            self._set_ids((int(x), int(y)), self.grid[y, x])
+
+    def expand_towards(self, direction: Direction, size: int):
+        self.tile_ids = expand_grid_towards(self.tile_ids, direction, size, fill=-1)
+        self.autotile_ids = expand_grid_towards(
+            self.autotile_ids, direction, size, fill=-1
+        )
+        super().expand_towards(direction, size)
+
+    def reduce_towards(self, direction: Direction, size: int):
+        self.tile_ids = reduce_grid_towards(self.tile_ids, direction, size)
+        self.autotile_ids = reduce_grid_towards(self.autotile_ids, direction, size)
+        super().reduce_towards(direction, size)
+
+    def resize(self, size: tuple[int, int]):
+        self.tile_ids = resize_grid(self.tile_ids, size, fill=-1)
+        self.autotile_ids = resize_grid(self.autotile_ids, size, fill=-1)
+        super().resize(size)
+
     def populate_from_data(self, elements_data: list[dict]):
         """Populate the layer with tiles from a list of data dictionaries."""
         from ...serialization import element_from_dict
@@ -123,19 +214,70 @@ class TilemapLayer(GridLayer):
         if not super().add_element(tile):
             return False
 
-        if isinstance(tile, AutotileTile):
-            self._handle_add_autotile_tile(tile, apply_formatting)
+        if tile.is_autotile:
+            self._handle_add_autotile_tile(tile, apply_formatting)  # type: ignore
 
         if apply_formatting:
             tile.format()
 
         return True
 
+    def add_tiles(self, tiles: "Iterable[Tile]", apply_formatting=False):
+        """Add many tiles to the layer's grid at once. All footprints are bounds-checked in a single pass before any tile is added, and formatting (if applied) runs once over the area the added tiles affect instead of once per tile. Returns the tiles that were added."""
+        # Tiles are walked twice, so a generator must not be used up by the bounds check.
+        tiles = list(tiles)
+        footprints: "list[list[tuple[int, int]]]" = []
+        positions: "list[tuple[int, int] | None]" = []
+        for tile in tiles:
+            footprint = [] if tile.position is None else tile.footprint_positions()
+            footprints.append(footprint)
+            positions.extend(footprint or [None])
+        self.checker.check_positions(positions)
+
+        added_tiles: "list[Tile]" = []
+        for tile, footprint in zip(tiles, footprints):
+            if isinstance(tile, AttachedTile) and tile.master_orientation(self) is None:
+                continue
+            if not self._add_element(tile, footprint):
+                continue
+            if tile.is_autotile:
+                self._handle_add_autotile_tile(tile, apply_formatting=False)  # type: ignore
+            added_tiles.append(tile)
+
+        if apply_formatting and added_tiles:
+            self._format_added_tiles(added_tiles)
+
+        return added_tiles
+
+    def _format_added_tiles(self, tiles: "list[Tile]"):
+        """Format freshly added tiles, plus every autotile within two cells of the added autotiles. Every autotile is formatted once, even if several added tiles are close to it."""
+        # A tile can be replaced by a later one of the same batch.
+        tiles = [
+            tile for tile in tiles if self.grid[tile.position[1], tile.position[0]] is tile
+        ]
+        for tile in tiles:
+            if not tile.is_autotile:
+                tile.format()
+
+        # One window per autotile, so far apart tiles don't reformat what lies between them.
+        # Like add_tile, plain tiles leave their neighbors alone.
+        areas: "dict[Area, None]" = {}
+        for tile in tiles:
+            if not tile.is_autotile:
+                continue
+            footprint = np.array(tile.footprint_positions())
+            min_x, min_y = footprint.min(axis=0).tolist()
+            max_x, max_y = footprint.max(axis=0).tolist()
+            areas[self.clip_area(min_x - 2, min_y - 2, max_x + 2, max_y + 2)] = None
+        self.formatter.format_areas(list(areas))
+
     def _handle_add_autotile_tile(self, tile: "AutotileTile", apply_formatting: bool):
         """Handle adding an autotile tile to the layer."""
-        if tile.name not in self.autotile_rules:
-            self.autotile_rules[tile.name] = self.autotile_rules["default"]
-        tile.rules = self.autotile_rules[tile.name]
+        rules = self.autotile_rules.get(tile.name)
+        if rules is None:
+            # A copy, so appending rules to this object doesn't change the default ones.
+            rules = self.autotile_rules[tile.name] = list(self.autotile_rules["default"])
+        tile.rules = rules
 
         if apply_formatting:
             self.formatter.format_autotile_tile_neighbors(tile)
@@ -153,8 +295,8 @@ class TilemapLayer(GridLayer):
             return None
 
         super().remove_element(tile)
-        if isinstance(tile, AutotileTile):
-            self._handle_remove_autotile_tile(tile, apply_formatting)
+        if tile.is_autotile:
+            self._handle_remove_autotile_tile(tile, apply_formatting)  # type: ignore
 
         return tile
 
@@ -170,6 +312,15 @@ class TilemapLayer(GridLayer):
         """Get all tiles in the layer."""
         return cast(list[Tile], self.elements)
 
+    def get_tiles_in_area(self, area: "Area") -> list[Tile]:
+        """Get the tiles covering at least one cell of an area (bounds inclusive, already clipped to the grid, e.g. by clip_area). Only the ids of the area's cells are scanned."""
+        x0, y0, x1, y1 = area
+        if x1 < x0 or y1 < y0:
+            return []
+
+        ys, xs = np.nonzero(self.tile_ids[y0 : y1 + 1, x0 : x1 + 1] != -1)
+        return cast(list[Tile], unique_elements(self.grid[ys + y0, xs + x0]))
+
     def add_autotile_rule(self, name, *rules):
         """Append one or more rules to the list of rules for a specific autotile object."""
         for rule in rules:
@@ -179,9 +330,10 @@ class TilemapLayer(GridLayer):
         """Set the list of rules for a specific autotile object. It resets the rules for that object, so it must be used when it's needed to overwrite the default rules."""
         self.autotile_rules[name] = rules
 
-    def get_tile_at(self, position: tuple[int, int]):
+    def get_tile_at(self, position: tuple[int, int]) -> "Tile | None":
         """Get a tile at a given position."""
-        return cast("Tile | None", self.get_element_at(position))
+        # No cast: this is called for every neighbor probe, and the layer only holds tiles.
+        return self.get_element_at(position)  # type: ignore
 
     def get_edge_tiles(
         self, edge: Union[Direction, Literal["all"]] = "all", size=1, retreat=0
@@ -207,3 +359,12 @@ class TilemapLayer(GridLayer):
 
     def __setstate__(self, state):
         super().__setstate__(state)
+
+        # Layers pickled before the id grids existed only have their object grid.
+        if "tile_ids" not in state:
+            self._name_ids = {}
+            self._names = []
+            self.tile_ids = np.full((0, 0), -1, dtype=np.int32)
+            self.autotile_ids = np.full((0, 0), -1, dtype=np.int16)
+            if self._grid is not None:
+                self._rebuild_ids()
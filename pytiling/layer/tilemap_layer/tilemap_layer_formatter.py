@@ -1,5 +1,12 @@
-from typing import TYPE_CHECKING, Callable, Literal
+from typing import TYPE_CHECKING, Callable, Literal, Sequence, cast
+import numpy as np
+from pytiling.grid_element import unique_elements
 from pytiling.grid_element.tile.autotile import AutotileTile
+from pytiling.grid_element.tile.autotile.autotile_matcher import (
+    build_rule_table,
+    match_rules,
+    neighbor_bits_grid,
+)
 from blinker import Signal
 
 if TYPE_CHECKING:
@@ -14,16 +21,124 @@ class TilemapLayerFormatter:
         self.layer = layer
 
     def format_autotile_tile_neighbors(self, tile: "AutotileTile"):
-        # self.formatter.format_area(self.get_area_around(tile.position, 2))
-        tile_neighbors = self.layer.autotile_neighbor_processor.get_neighbors_of(
-            tile, radius=2
+        """Format the autotile tiles within two cells of the given tile. Only occupied cells of that area are visited."""
+        area = self.layer.get_area_around(tile.position, 2)
+        self._format_autotiles(
+            self._autotiles_in_area(area, skip=tile.position), [area]
         )
-        for row in tile_neighbors:
-            for neighbor in row:
-                if not isinstance(neighbor, AutotileTile):
-                    continue
-                neighbor.format()
+
+    def format_area(self, area: "Area"):
+        """Format the autotile tiles inside an area. Only occupied cells of the area are visited, and their displays are matched all at once."""
+        self._format_autotiles(self._autotiles_in_area(area), [area])
+
+    def format_areas(self, areas: "Sequence[Area]"):
+        """Format the autotile tiles inside several areas. Autotiles lying where areas overlap are formatted once, and cells outside every area are left alone."""
+        autotiles = cast(
+            "list[AutotileTile]",
+            unique_elements(
+                autotile for area in areas for autotile in self._autotiles_in_area(area)
+            ),
+        )
+        self._format_autotiles(autotiles, areas)
+
+    def _format_autotiles(
+        self, autotiles: "list[AutotileTile]", areas: "Sequence[Area]"
+    ):
+        """Format autotiles lying inside some areas, matching their displays in one batch per area when the layer's neighbor processor allows it."""
+        if not self._can_match_in_batch():
+            for autotile in autotiles:
+                autotile.format()
+            return
+
+        autotile_displays: dict[tuple[int, int], tuple[int, int]] = {}
+        for area in areas:
+            autotile_displays.update(self._match_autotile_displays(area))
+        for autotile in autotiles:
+            autotile.format_with_display(autotile_displays[autotile.position])
+
+    def _can_match_in_batch(self) -> bool:
+        """Whether autotile displays can be matched in batch. Packed neighborhoods only describe eight adjacency, so other rules go through AutotileTile.format() one tile at a time."""
+        return self.layer.autotile_neighbor_processor.adjacency_rule == "eight"
+
+    def _autotiles_in_area(
+        self, area: "Area", skip: tuple[int, int] | None = None
+    ) -> "list[AutotileTile]":
+        """Gather the autotiles of an area with one boolean mask over its slice of the grid, optionally leaving out one cell. They are gathered up front, so formatting them can't change which ones get visited."""
+        x0, y0, x1, y1 = area
+        window = (slice(y0, y1 + 1), slice(x0, x1 + 1))
+
+        is_autotile = self.layer.autotile_ids[window] != -1
+        if skip is not None:
+            is_autotile[skip[1] - y0, skip[0] - x0] = False
+        return self.layer.grid[window][is_autotile].tolist()
 
     def format_all_tiles(self):
-        """Format all tiles in the layer."""
-        self.layer.for_all_elements(lambda tile: tile.format())
+        """Format all tiles in the layer. Only occupied cells are visited, and autotile displays are matched for the whole layer at once instead of tile by tile."""
+        # Scanning the transposed ids keeps the column-major order of layer.tiles.
+        xs, ys = np.nonzero(self.layer.tile_ids.T != -1)
+        tiles = cast("list[Tile]", unique_elements(self.layer.grid[ys, xs]))
+        autotile_displays = None
+        if self._can_match_in_batch():
+            height, width = self.layer.tile_ids.shape
+            autotile_displays = self._match_autotile_displays(
+                self.layer.clip_area(0, 0, width - 1, height - 1)
+            )
+
+        for tile in tiles:
+            if tile.is_autotile and autotile_displays is not None:
+                tile.format_with_display(  # type: ignore
+                    autotile_displays[tile.position]
+                )
+            else:
+                tile.format()
+
+    def _match_autotile_displays(
+        self, area: "Area"
+    ) -> dict[tuple[int, int], tuple[int, int]]:
+        """Match the autotile display of every autotile cell of an area. The neighborhood masks are packed for the whole area at once (from the area grown by one cell, so its edges see their neighbors), and each autotile object resolves all of its cells with one rule table lookup. Neighbors are counted like the layer's autotile neighbor processor counts them."""
+        if not self._can_match_in_batch():
+            raise ValueError(
+                "Autotile displays can only be matched in batch with the eight adjacency rule"
+            )
+
+        x0, y0, x1, y1 = area
+        grown_x0, grown_y0, grown_x1, grown_y1 = self.layer.clip_area(
+            x0 - 1, y0 - 1, x1 + 1, y1 + 1
+        )
+        grown_window = (slice(grown_y0, grown_y1 + 1), slice(grown_x0, grown_x1 + 1))
+
+        ys, xs = np.nonzero(self.layer.autotile_ids[y0 : y1 + 1, x0 : x1 + 1] != -1)
+        if len(ys) == 0:
+            return {}
+
+        # Where each cell sits in the grown window.
+        grown_ys, grown_xs = ys + (y0 - grown_y0), xs + (x0 - grown_x0)
+        ys += y0
+        xs += x0
+        cell_name_ids = self.layer.autotile_ids[ys, xs]
+
+        # With same_autotile_object, only autotiles of the same object are neighbors, so
+        # each object packs its own occupancy. Otherwise any tile is a neighbor.
+        shared_bits = None
+        if not self.layer.autotile_neighbor_processor.same_autotile_object:
+            shared_bits = neighbor_bits_grid(self.layer.tile_ids[grown_window] != -1)
+        grown_autotile_ids = self.layer.autotile_ids[grown_window]
+
+        displays = np.empty((len(ys), 2), dtype=np.int16)
+        for name_id in np.unique(cell_name_ids).tolist():
+            is_named = cell_name_ids == name_id
+            bits = shared_bits
+            if bits is None:
+                bits = neighbor_bits_grid(grown_autotile_ids == name_id)
+            rules = self.layer.autotile_rules[self.layer.name_for_id(name_id)]
+            rule_table = build_rule_table(tuple(rules))
+            displays[is_named] = match_rules(
+                bits[grown_ys[is_named], grown_xs[is_named]], rule_table
+            )
+
+        return {
+            (x, y): (display_x, display_y)
+            for x, y, (display_x, display_y) in zip(
+                xs.tolist(), ys.tolist(), displays.tolist()
+            )
+        }
@@ -1,7 +1,9 @@
-from typing import TYPE_CHECKING, Literal, Callable, Union
+from typing import TYPE_CHECKING, Literal, Union
 import numpy as np
-from pytiling.grid_element.tile.autotile import AutotileTile
-
+from pytiling.grid_element.tile.autotile.autotile_matcher import (
+    FULL_NEIGHBOR_MASK,
+    NEIGHBOR_WEIGHTS,
+)
 
 if TYPE_CHECKING:
     from . import TilemapLayer
@@ -9,6 +11,9 @@ if TYPE_CHECKING:
 
 Neighbor = Union[Literal["out_of_grid"], "Tile"]
 
+# (x, y) offsets of the four-adjacency neighbors: right, top, left, bottom.
+_FOUR_OFFSETS = ((1, 0), (0, -1), (-1, 0), (0, 1))
+
 
 class TilemapLayerNeighborProcessor:
     """Processes tile neighbors in a tilemap layer, considering out-of-grid spaces as neighbors."""
@@ -22,28 +27,135 @@ class TilemapLayerNeighborProcessor:
         self.layer = layer
         self.adjacency_rule: Literal["eight", "four"] = adjancecy_rule
         self.same_autotile_object = same_autotile_object
+        self._scratch_bool_grids: dict[int, np.ndarray] = {}
 
     def get_amount_of_neighbors_of(self, tile: "Tile", radius: int = 1):
-        neighbors = 0
+        if self.adjacency_rule != "eight":
+            return int(np.count_nonzero(self.get_neighbors_bool_grid(tile, radius)))
+        if radius == 1:
+            return self.get_neighbors_mask(tile).bit_count()
+
+        # Counted straight from the in-grid window, without building the neighbor matrix.
+        matrix_size = self._get_matrix_size(radius)
+        window = self._in_grid_window(tile, radius)
+        if window is None:
+            return matrix_size * matrix_size - 1
+
+        (rows, columns), _ = window
+        out_of_grid = matrix_size * matrix_size - (rows.stop - rows.start) * (
+            columns.stop - columns.start
+        )
+        if self.same_autotile_object and not tile.is_autotile:
+            return out_of_grid
+
+        occupancy = self._occupancy(tile, (rows, columns))
+        tile_x, tile_y = tile.position
+        # The tile's own cell is always inside the window, but it isn't its own neighbor.
+        own_cell = occupancy[tile_y - rows.start, tile_x - columns.start]
+        return int(np.count_nonzero(occupancy)) - int(own_cell) + out_of_grid
+
+    def get_neighbors_mask(self, tile: "Tile") -> int:
+        """Pack the eight direct neighbors of a tile into an int, one bit per neighbor as laid out by ``NEIGHBOR_BITS``. Same cells as ``get_neighbors_bool_grid(tile)``, read straight from the id grids."""
+        if self.adjacency_rule != "eight":
+            raise ValueError("Neighbor masks need the eight adjacency rule")
+
+        window = self._in_grid_window(tile, 1)
+        if window is None:
+            return FULL_NEIGHBOR_MASK
+
+        grid_index, matrix_index = window
+        weights = NEIGHBOR_WEIGHTS[matrix_index]
+        # Out-of-grid cells count as neighbors: their bits are the ones the window doesn't cover.
+        out_of_grid = FULL_NEIGHBOR_MASK & ~int(weights.sum())
+        if self.same_autotile_object and not tile.is_autotile:
+            return out_of_grid
+        return out_of_grid | int(weights[self._occupancy(tile, grid_index)].sum())
 
-        def neighbor_callback(neighbor: "Neighbor", _position: tuple[int, int]):
-            nonlocal neighbors
-            neighbors += 1
+    def get_neighbors_bool_grid(
+        self, tile: "Tile", radius: int = 1, out: np.ndarray | None = None
+    ):
+        """Get which cells around a tile hold a neighbor, as a square bool grid centered on it. If ``out`` is given (a bool array of that shape), the grid is written into it and it is returned, so loops over many tiles can reuse one buffer. Its content is only valid until the next call that reuses it."""
+        if self.adjacency_rule == "four":
+            return self._four_neighbors_bool_grid(tile, radius, out)
+        if self.adjacency_rule != "eight":
+            raise ValueError(f"Invalid adjacency rule: {self.adjacency_rule}")
+
+        # Out-of-grid cells count as neighbors, so only the in-grid window gets overwritten.
+        neighbors = self._new_bool_grid(radius, True, out)
 
-        self._for_neighbor_of(neighbor_callback, tile, radius)
+        window = self._in_grid_window(tile, radius)
+        if window is not None:
+            grid_index, matrix_index = window
+            neighbors[matrix_index] = self._occupancy(tile, grid_index)
+
+        neighbors[radius, radius] = False
         return neighbors
 
-    def get_neighbors_bool_grid(self, tile: "Tile", radius: int = 1):
-        matrix_size = self._get_matrix_size(radius)
-        neighbors = np.full((matrix_size, matrix_size), False)
+    def _in_grid_window(self, tile: "Tile", radius: int):
+        """The part of the square of the given radius around a tile that lies inside the grid, as a pair of indexes: one into the layer grids and one into a neighbor matrix. None if no part of it does."""
+        tile_x, tile_y = tile.position
+        height, width = self.layer.tile_ids.shape
+        x0, x1 = max(tile_x - radius, 0), min(tile_x + radius + 1, width)
+        y0, y1 = max(tile_y - radius, 0), min(tile_y + radius + 1, height)
+        if x0 >= x1 or y0 >= y1:
+            return None
 
-        def neighbor_callback(_neighbor: "Neighbor", position: tuple[int, int]):
-            offset_x, offset_y = self.calculate_offset(position, tile, radius)
-            neighbors[offset_y, offset_x] = True
+        offset_x, offset_y = tile_x - radius, tile_y - radius
+        return (
+            (slice(y0, y1), slice(x0, x1)),
+            (
+                slice(y0 - offset_y, y1 - offset_y),
+                slice(x0 - offset_x, x1 - offset_x),
+            ),
+        )
 
-        self._for_neighbor_of(neighbor_callback, tile, radius)
+    def _four_neighbors_bool_grid(
+        self, tile: "Tile", radius: int, out: np.ndarray | None = None
+    ):
+        if radius != 1:
+            raise ValueError("Four neighbors adjacency requires radius=1")
+
+        # Too few cells for array arithmetic to pay off, so they're probed one by one.
+        neighbors = self._new_bool_grid(radius, False, out)
+        tile_x, tile_y = tile.position
+        height, width = self.layer.tile_ids.shape
+        for dx, dy in _FOUR_OFFSETS:
+            x, y = tile_x + dx, tile_y + dy
+            # Out-of-grid cells count as neighbors.
+            neighbors[dy + 1, dx + 1] = not (
+                0 <= x < width and 0 <= y < height
+            ) or self._occupancy(tile, (y, x))
         return neighbors
 
+    def _new_bool_grid(self, radius: int, fill: bool, out: np.ndarray | None):
+        """A bool grid for a neighborhood of the given radius, filled with ``fill``. ``out`` is reused when given."""
+        if out is None:
+            matrix_size = self._get_matrix_size(radius)
+            return np.full((matrix_size, matrix_size), fill)
+
+        out.fill(fill)
+        return out
+
+    def scratch_bool_grid(self, radius: int = 1) -> np.ndarray:
+        """A bool grid owned by this processor, to pass as ``out`` to ``get_neighbors_bool_grid``. The same array is returned for a given radius every time."""
+        scratch = self._scratch_bool_grids.get(radius)
+        if scratch is None:
+            matrix_size = self._get_matrix_size(radius)
+            scratch = np.empty((matrix_size, matrix_size), dtype=bool)
+            self._scratch_bool_grids[radius] = scratch
+        return scratch
+
+    def _occupancy(self, tile: "Tile", index):
+        """Which cells at ``index`` (slices or index arrays of the layer grid) hold a tile that counts as a neighbor of ``tile``."""
+        if not self.same_autotile_object:
+            return self.layer.tile_ids[index] != -1
+        autotile_ids = self.layer.autotile_ids[index]
+        # A query must not intern a name the layer has never held.
+        name_id = self.layer.find_name_id(tile.name) if tile.is_autotile else None
+        if name_id is None:
+            return np.zeros(np.shape(autotile_ids), dtype=bool)
+        return autotile_ids == name_id
+
     @staticmethod
     def neighbors_bool_grid_from_occupancy(
         position: tuple[int, int],
@@ -74,14 +186,32 @@ class TilemapLayerNeighborProcessor:
         return neighbors
 
     def get_neighbors_of(self, tile: "Tile", radius: int = 1):
+        if self.adjacency_rule != "eight":
+            return self._get_neighbors_of_by_position(tile, radius)
+
         matrix_size = self._get_matrix_size(radius)
-        neighbors = np.empty((matrix_size, matrix_size), dtype=object)
+        neighbors = np.full((matrix_size, matrix_size), "out_of_grid", dtype=object)
 
-        def neighbor_callback(neighbor: "Neighbor", position: tuple[int, int]):
-            offset_x, offset_y = self.calculate_offset(position, tile, radius)
-            neighbors[offset_y, offset_x] = neighbor
+        window = self._in_grid_window(tile, radius)
+        if window is not None:
+            grid_index, matrix_index = window
+            cells = self.layer.grid[grid_index]
+            if self.same_autotile_object:
+                cells = np.where(self._occupancy(tile, grid_index), cells, None)
+            neighbors[matrix_index] = cells
 
-        self._for_neighbor_of(neighbor_callback, tile, radius)
+        neighbors[radius, radius] = None
+        return neighbors
+
+    def _get_neighbors_of_by_position(self, tile: "Tile", radius: int):
+        matrix_size = self._get_matrix_size(radius)
+        neighbors = np.empty((matrix_size, matrix_size), dtype=object)
+
+        tile_x, tile_y = tile.position
+        for x, y in self._generate_positions(tile.position, radius):
+            neighbor = self._get_neighbor_of_tile_at(tile, x, y)
+            if neighbor is not None:
+                neighbors[y - tile_y + radius, x - tile_x + radius] = neighbor
         return neighbors
 
     def calculate_offset(
@@ -92,20 +222,6 @@ class TilemapLayerNeighborProcessor:
         tile_x, tile_y = tile.position
         return ((x - tile_x) + radius, (y - tile_y) + radius)
 
-    def _for_neighbor_of(
-        self,
-        callback: Callable[[Neighbor, tuple[int, int]], None],
-        tile: "Tile",
-        radius,
-    ):
-        positions = self._generate_positions(tile.position, radius)
-
-        for x, y in positions:
-            neighbor = self._get_neighbor_of_tile_at(tile, x, y)
-            if neighbor is None:
-                continue
-            callback(neighbor, (x, y))
-
     def _generate_positions(
         self,
         center_position: tuple[int, int],
@@ -123,12 +239,7 @@ class TilemapLayerNeighborProcessor:
         elif self.adjacency_rule == "four":
             if radius != 1:
                 raise ValueError("Four neighbors adjacency requires radius=1")
-            positions = [
-                (center_x + 1, center_y),
-                (center_x, center_y - 1),
-                (center_x - 1, center_y),
-                (center_x, center_y + 1),
-            ]
+            positions = [(center_x + dx, center_y + dy) for dx, dy in _FOUR_OFFSETS]
         else:
             raise ValueError(f"Invalid adjacency rule: {self.adjacency_rule}")
         return positions
@@ -148,8 +259,8 @@ class TilemapLayerNeighborProcessor:
         if self.same_autotile_object:
             if (
                 neighbor is not None
-                and isinstance(tile, AutotileTile)
-                and isinstance(neighbor, AutotileTile)
+                and tile.is_autotile
+                and neighbor.is_autotile
                 and neighbor.name == tile.name
             ):
                 return neighbor
@@ -1,4 +1,5 @@
 from ..tools.tilemap_border_tracer import TilemapBorderTracer
+import numpy as np
 import pymunk
 
 
@@ -23,12 +24,17 @@ class PymunkTilemapPhysics:
         # Add new lines
         layer = self.border_tracer.tilemap_layer
 
-        for line in self.border_tracer.lines:
-            x1, y1 = line.start
-            x2, y2 = line.end
-            start = layer.grid_pos_to_actual_pos((x1, y1 - 1))
-            end = layer.grid_pos_to_actual_pos((x2, y2 - 1))
+        lines = list(self.border_tracer.lines)
+        if not lines:
+            return
 
+        grid_positions = np.array(
+            [[line.start, line.end] for line in lines], dtype=np.int64
+        ).reshape(-1, 2)
+        grid_positions[:, 1] -= 1
+        actual_positions = layer.grid_pos_to_actual_pos_batch(grid_positions).tolist()
+
+        for start, end in zip(actual_positions[::2], actual_positions[1::2]):
             physics_line = pymunk.Segment(self.body, start, end, radius=2)
             physics_line.collision_type = 2
             physics_line.friction = 1
@@ -1,10 +1,12 @@
 from typing import TYPE_CHECKING
+import numpy as np
 import pyglet
 
 if TYPE_CHECKING:
     from pytiling.layer.tilemap_layer.tilemap_layer import TilemapLayer
     from .tileset_image import TilesetImage
     from pytiling.grid_element.tile import Tile
+    from pytiling.grid_element import GridElement
 
 
 class LayerRenderer:
@@ -12,7 +14,8 @@ class LayerRenderer:
         self.layer = layer
         self.tileset_image = tileset_image
         self.batch = pyglet.graphics.Batch()
-        self.sprites = []  # Keep references to sprites
+        # One sprite per grid position, reused whenever its tile is formatted again.
+        self.sprites: dict[tuple[int, int], pyglet.sprite.Sprite] = {}
 
         self._initialize_tile_sprites()
 
@@ -21,12 +24,37 @@ class LayerRenderer:
         self.layer.events["tile_formatted"].connect(
             self._handle_tile_formatted, weak=True
         )
-        self.layer.for_all_elements(self.create_tile_sprite)
+        self.layer.events["element_removed"].connect(
+            self._handle_element_removed, weak=True
+        )
+
+        actual_positions = self._actual_positions_grid()
+        for tile in self.layer.tiles:
+            x, y = tile.position
+            self.create_tile_sprite(tile, actual_positions[y][x])
+
+    def _actual_positions_grid(self) -> list[list[list[float]]]:
+        """Window position of every grid cell of the layer, indexed as [y][x]. Same result as grid_pos_to_actual_pos, computed for the whole grid at once."""
+        grid_width, grid_height = self.layer.grid_size
+        xs, ys = np.meshgrid(np.arange(grid_width), np.arange(grid_height))
+        actual_positions = self.layer.grid_pos_to_actual_pos_batch(
+            np.stack((xs, ys), axis=-1)
+        )
+        return actual_positions.reshape(grid_height, grid_width, 2).tolist()
 
     def _handle_tile_formatted(self, sender, tile: "Tile"):
         self.create_tile_sprite(tile)
 
-    def create_tile_sprite(self, tile: "Tile"):
+    def _handle_element_removed(
+        self, sender, element: "GridElement", layer_name: str
+    ):
+        sprite = self.sprites.pop(element.position, None)
+        if sprite is not None:
+            sprite.delete()
+
+    def create_tile_sprite(
+        self, tile: "Tile", actual_position: "list[float] | None" = None
+    ):
         if not tile.position or tile.display is None:
             return
 
@@ -34,13 +62,20 @@ class LayerRenderer:
         if tile_image is None:
             return
 
-        x, y = tile.position
-        tile_x, tile_y = self.layer.grid_pos_to_actual_pos((x, y))
+        texture = tile_image.get_texture()
+        sprite = self.sprites.get(tile.position)
+        if sprite is not None:
+            # Re-formatted tile: swap the texture instead of stacking a new sprite.
+            sprite.image = texture
+            return
+
+        if actual_position is None:
+            actual_position = list(self.layer.grid_pos_to_actual_pos(tile.position))
+        tile_x, tile_y = actual_position
         # Create sprite with texture and add to batch
-        spr = pyglet.sprite.Sprite(
-            tile_image.get_texture(), x=tile_x, y=tile_y, batch=self.batch
+        self.sprites[tile.position] = pyglet.sprite.Sprite(
+            texture, x=tile_x, y=tile_y, batch=self.batch
         )
-        self.sprites.append(spr)
 
     def render(self):
         self.batch.draw()
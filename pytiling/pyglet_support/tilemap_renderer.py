@@ -1,4 +1,8 @@
+from ctypes import byref
+import numpy as np
 import pyglet
+from pyglet.gl import GL_LINES, GL_POINTS, GL_POINT_SIZE, GLfloat, glGetFloatv, glPointSize
+from functools import cached_property
 from typing import TYPE_CHECKING
 from pytiling.tools.tilemap_border_tracer import TilemapBorderTracer
 from pytiling.tilemap import Tilemap
@@ -19,7 +23,7 @@ class PygletTilemapRenderer:
         self.tileset_images: dict["Tileset", TilesetImage] = {}
 
         self.debug_batch = pyglet.graphics.Batch()
-        self.debug_shapes: set[pyglet.shapes.ShapeBase] = set()
+        self.debug_vertex_lists: list = []
 
         self._create_tileset_images()
         self._create_layer_renderers()
@@ -41,49 +45,61 @@ class PygletTilemapRenderer:
             self.layer_renderers[layer.name] = layer_renderer
 
     def update_debug_lines(self, border_tracer: TilemapBorderTracer):
-        """Creates a vertex list for lines in the Pyglet batch."""
+        """Creates a vertex list for lines in the Pyglet batch, plus one for their end points."""
         layer = border_tracer.tilemap_layer
-        self.debug_shapes = set()
-
-        for line in border_tracer.lines:
-            x1, y1 = line.start
-            x2, y2 = line.end
-
-            x1, y1 = layer.grid_pos_to_actual_pos((x1, y1 - 1))
-            x2, y2 = layer.grid_pos_to_actual_pos((x2, y2 - 1))
-
-            if line.orientation == "vertical":
-                color = (255, 0, 0)
-            else:
-                color = (0, 255, 0)
-
-            line_display = pyglet.shapes.Line(
-                x1,
-                y1,
-                x2,
-                y2,
-                thickness=1,
-                color=color,
-                batch=self.debug_batch,
-            )
-            self.debug_shapes.add(line_display)
-
-            circle = pyglet.shapes.Circle(
-                x=x1 + (2 if line.orientation == "vertical" else -2),
-                y=y1,
-                radius=3,
-                color=color,
-                batch=self.debug_batch,
-            )
-            self.debug_shapes.add(circle)
-            circle = pyglet.shapes.Circle(
-                x=x2 + (2 if line.orientation == "vertical" else -2),
-                y=y2,
-                radius=3,
-                color=color,
-                batch=self.debug_batch,
-            )
-            self.debug_shapes.add(circle)
+
+        for vertex_list in self.debug_vertex_lists:
+            vertex_list.delete()
+        self.debug_vertex_lists = []
+
+        lines = list(border_tracer.lines)
+        if not lines:
+            return
+
+        # Start and end of each line, one after the other.
+        grid_positions = np.array(
+            [[line.start, line.end] for line in lines], dtype=np.int64
+        ).reshape(-1, 2)
+        grid_positions[:, 1] -= 1
+        vertices = layer.grid_pos_to_actual_pos_batch(grid_positions).astype(
+            np.float32
+        )
+        vertical = np.repeat([line.orientation == "vertical" for line in lines], 2)
+
+        colors = np.where(
+            vertical[:, None],
+            np.array([255, 0, 0, 255], dtype=np.uint8),
+            np.array([0, 255, 0, 255], dtype=np.uint8),
+        )
+        points = vertices.copy()
+        points[:, 0] += np.where(vertical, 2, -2)
+
+        self.debug_vertex_lists = [
+            self._create_debug_vertex_list(GL_LINES, vertices, colors),
+            self._create_debug_vertex_list(GL_POINTS, points, colors),
+        ]
+
+    @cached_property
+    def debug_group(self) -> pyglet.graphics.ShaderGroup:
+        """The group every debug vertex list is drawn with. Built on first use, since the shader needs a GL context."""
+        return pyglet.graphics.ShaderGroup(pyglet.shapes.get_default_shader())
+
+    def _create_debug_vertex_list(
+        self, mode: int, vertices: np.ndarray, colors: np.ndarray
+    ):
+        """Submit every vertex of a debug primitive to the debug batch in one vertex list."""
+        count = len(vertices)
+        return self.debug_group.program.vertex_list(
+            count,
+            mode,
+            self.debug_batch,
+            self.debug_group,
+            position=("f", vertices.ravel().tolist()),
+            colors=("Bn", colors.ravel().tolist()),
+            translation=("f", (0.0, 0.0) * count),
+            zposition=("f", (0.0,) * count),
+            rotation=("f", (0.0,) * count),
+        )
 
     def render_all_layers(self):
         """Draw all layers of the tilemap according to their order. So the first layer is drawn first, etc."""
@@ -97,4 +113,8 @@ class PygletTilemapRenderer:
 
     def render_debug(self):
         """Draw debug content."""
+        point_size = GLfloat()
+        glGetFloatv(GL_POINT_SIZE, byref(point_size))
+        glPointSize(6)
         self.debug_batch.draw()
+        glPointSize(point_size.value)
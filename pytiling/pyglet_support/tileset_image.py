@@ -1,7 +1,6 @@
 import numpy as np
 import pyglet
 from typing import TYPE_CHECKING
-from PIL import Image
 from .utils import set_pixelated_scaling
 
 if TYPE_CHECKING:
@@ -18,6 +17,10 @@ class TilesetImage:
             dtype=object,
         )
 
+        # Scratch buffer reused by every tile while flipping it upside down.
+        tile_width, tile_height = tileset.tile_size
+        self._scratch = np.empty((tile_height, tile_width, 4), dtype=np.uint8)
+
         self.tileset.for_tile_image(self._populate_tile_images)
 
     def _populate_tile_images(self, byte_data: bytes, x: int, y: int):
@@ -28,9 +31,12 @@ class TilesetImage:
         """Create a pyglet image from a byte data."""
         tile_width, tile_height = self.tileset.tile_size
 
-        image_data = Image.frombytes("RGBA", (tile_width, tile_height), byte_data)
-        image_data = image_data.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-        byte_data_flipped = image_data.tobytes()
+        # Pyglet expects rows bottom to top.
+        self._scratch[:] = np.frombuffer(byte_data, dtype=np.uint8).reshape(
+            tile_height, tile_width, 4
+        )[::-1]
+        # ImageData keeps a reference to its data, so it gets its own copy of the buffer.
+        byte_data_flipped = self._scratch.tobytes()
         pyglet_image = set_pixelated_scaling(
             pyglet.image.ImageData(tile_width, tile_height, "RGBA", byte_data_flipped)
         )
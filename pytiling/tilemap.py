@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Literal, cast, Sequence, Callable
+from typing import TYPE_CHECKING, Literal, cast, Sequence, Iterator
 from .grid_map import GridMap
 from .utils import direction_vectors
 
@@ -25,7 +25,8 @@ class Tilemap(GridMap):
     ):
         super().__init__(tile_size, grid_size, min_grid_size, max_grid_size)
 
-        self.tilesets: set["Tileset"] = set()
+        # A handful of tilesets at most, kept in the order their layers were added.
+        self.tilesets: list["Tileset"] = []
 
     def to_dict(self):
         """Serialize the tilemap to a dictionary."""
@@ -34,10 +35,6 @@ class Tilemap(GridMap):
         # Tilesets are derived from layers, so no need to serialize them directly.
         return data
 
-    def on_layer_event(self, event_name: str, callback: Callable):
-        for layer in self.layers:
-            layer.events[event_name].connect(callback, weak=True)
-
     def add_layer(self, layer: "GridLayer", position: int | Literal["end"] = "end"):
         """Add a layer to the tilemap. By default, it will be added to the end of the list, so it's a good practice to add layers in order."""
         layer = cast("TilemapLayer", layer)
@@ -68,10 +65,11 @@ class Tilemap(GridMap):
         from .grid_element.tile.attached import AttachedTile
 
         footprint = changed.footprint_positions()
+        layers = self._layers
 
         if not removed and not isinstance(changed, AttachedTile):
             for position in footprint:
-                for layer in self.layers:
+                for layer in layers:
                     element = layer.get_element_at(position)
                     if isinstance(element, AttachedTile):
                         element.remove()
@@ -80,7 +78,7 @@ class Tilemap(GridMap):
         for position in footprint:
             for dx, dy in direction_vectors.values():
                 neighbor_position = (position[0] + dx, position[1] + dy)
-                for layer in self.layers:
+                for layer in layers:
                     element = layer.get_element_at(neighbor_position)
                     if isinstance(element, AttachedTile) and id(element) not in seen:
                         seen.add(id(element))
@@ -95,7 +93,8 @@ class Tilemap(GridMap):
 
     def _add_tileset(self, tileset: "Tileset"):
         tileset.tile_size = self.tile_size
-        self.tilesets.add(tileset)
+        if tileset not in self.tilesets:
+            self.tilesets.append(tileset)
 
     def get_layer(self, name: str) -> "TilemapLayer":
         """Get a layer by its name."""
@@ -106,6 +105,19 @@ class Tilemap(GridMap):
         """Get all tiles in the tilemap."""
         return cast("list[Tile]", self.all_elements)
 
+    def query_visible(
+        self, viewport_rect: tuple[float, float, float, float]
+    ) -> Iterator["Tile"]:
+        """Iterate over the tiles at least partly inside a window rectangle, given as (x, y, width, height) from its bottom-left corner. Tiles are yielded layer by layer, starting from the bottom one, and only the cells under the rectangle are scanned. Edges are inclusive: the cells under the right and top edges are part of the query, so a rectangle ending exactly on a cell border also gets the row or column past it."""
+        x, y, width, height = viewport_rect
+        left, top = self.actual_pos_to_grid_pos((x, y + height))
+        right, bottom = self.actual_pos_to_grid_pos((x + width, y))
+
+        for layer in self.layers:
+            yield from layer.get_tiles_in_area(
+                layer.clip_area(left, top, right, bottom)
+            )
+
     def format_all_tiles(self):
         """Format all tiles in the tilemap."""
         for layer in self.layers:
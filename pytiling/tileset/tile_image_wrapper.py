@@ -1,22 +1,46 @@
-from PIL import Image
-import io
-from functools import cached_property
+import numpy as np
+from functools import lru_cache
 
 
 class TileImageWrapper:
-    """This class represents a tile image. It contains the image data and the tile size."""
+    """This class represents a tile image. It contains the raw pixel data of the tile, along with the image mode (and palette transparency, if any) needed to read it."""
 
-    def __init__(self, image: bytes):
+    def __init__(
+        self,
+        image: bytes,
+        mode: str,
+        transparency: int | bytes | None = None,
+    ):
         self.image = image
+        self.mode = mode
+        self.transparency = transparency
 
-    @cached_property
+    @property
     def has_transparency(self) -> bool:
-        image = Image.open(io.BytesIO(self.image))
+        """Whether any pixel of the tile is not fully opaque. Tiles with the same pixels (e.g. blank ones) share one check."""
+        return _bytes_have_transparency(self.image, self.mode, self.transparency)
 
-        if image.mode in ("RGBA", "LA") or (
-            image.mode == "P" and "transparency" in image.info
-        ):
-            alpha = image.getchannel("A")
-            return any(pixel < 255 for pixel in alpha.getdata())
 
+@lru_cache(maxsize=4096)
+def _bytes_have_transparency(
+    image: bytes, mode: str, transparency: int | bytes | None
+) -> bool:
+    """Whether any pixel of a raw image is not fully opaque. Read straight from the raw pixel data with NumPy."""
+    pixels = np.frombuffer(image, dtype=np.uint8)
+    if pixels.size == 0:
         return False
+
+    if mode == "RGBA":
+        return bool(pixels[3::4].min() < 255)
+    if mode in ("LA", "PA"):
+        return bool(pixels[1::2].min() < 255)
+    if mode == "P" and transparency is not None:
+        if isinstance(transparency, int):
+            return bool((pixels == transparency).any())
+        # One alpha value per palette index; indexes past the table are opaque.
+        palette_alpha = np.full(256, 255, dtype=np.uint8)
+        table = np.frombuffer(transparency, dtype=np.uint8)[:256]
+        palette_alpha[: table.size] = table
+        return bool(palette_alpha[pixels].min() < 255)
+
+    return False
@@ -5,6 +5,9 @@ from typing import Any, Callable
 from .tile_image_wrapper import TileImageWrapper
 from functools import cached_property
 
+# Image modes whose pixels NumPy exposes as plain arrays with the same bytes as PIL's tobytes().
+ARRAY_MODES = ("L", "LA", "P", "PA", "RGB", "RGBA", "CMYK")
+
 
 class Tileset:
     """This object works over a tileset, mainly to get the tiles from it as byte images."""
@@ -13,12 +16,13 @@ class Tileset:
         self.tileset_path = tileset_path
         self.atlas_image = Image.open(tileset_path)
         self._tile_size: tuple[int, int] | None = None
+        self._grid_size: tuple[int, int] | None = None
         self._tile_image_wrappers: np.ndarray[tuple[int, int], Any] | None = None
 
     @property
     def tile_size(self) -> tuple[int, int]:
         """Get the tile size of the tileset."""
-        if not self._tile_size:
+        if self._tile_size is None:
             raise ValueError(
                 "Tile size not set for the tileset. Ensure it has been added to a tilemap (this is done automatically when adding a layer with this tileset to a tilemap)."
             )
@@ -42,17 +46,27 @@ class Tileset:
 
     @tile_size.setter
     def tile_size(self, value: tuple[int, int]):
-        """Set the tile size of the tileset."""
+        """Set the tile size of the tileset. The tiles are only cut out again if the size changed."""
+        if value == self._tile_size and self._tile_image_wrappers is not None:
+            return
+
         self._tile_size = value
+        self._grid_size = (
+            self.atlas_image.width // value[0],
+            self.atlas_image.height // value[1],
+        )
+        self.tile_image_wrappers = self._get_tile_image_wrappers()
+        self.__dict__.pop("tile_images", None)
 
-        if not self._tile_image_wrappers:
-            self.tile_image_wrappers = self._get_tile_image_wrappers()
+    @cached_property
+    def atlas_pixels(self) -> np.ndarray:
+        """The decoded pixels of the atlas image, as an array of shape (height, width) or (height, width, channels). Decoded once, whatever tile sizes the tileset is cut with."""
+        return np.asarray(self.atlas_image)
 
     def _get_tile_image_wrappers(self) -> np.ndarray[tuple[int, int], Any]:
         tile_width, tile_height = self.tile_size
-        tile_image_wrappers = np.empty(
-            (self.grid_size[1], self.grid_size[0]), dtype=object
-        )
+        grid_width, grid_height = self.grid_size
+        tile_image_wrappers = np.empty((grid_height, grid_width), dtype=object)
 
         if self.atlas_image.width % tile_width != 0:
             warnings.warn(
@@ -65,28 +79,42 @@ class Tileset:
                 UserWarning,
             )
 
-        for x in range(0, self.grid_size[0] * tile_width, tile_width):
-            for y in range(0, self.grid_size[1] * tile_height, tile_height):
-                tile_image = self.atlas_image.crop(
-                    (x, y, x + tile_width, y + tile_height)
-                ).tobytes()
-
-                tile_x = x // tile_width
-                tile_y = y // tile_height
-
-                tile_image_wrappers[tile_y, tile_x] = TileImageWrapper(tile_image)
+        if self.atlas_image.mode not in ARRAY_MODES:
+            # Pixels of these modes don't map one to one to array items (e.g. packed bits).
+            for x in range(0, grid_width * tile_width, tile_width):
+                for y in range(0, grid_height * tile_height, tile_height):
+                    tile_image = self.atlas_image.crop(
+                        (x, y, x + tile_width, y + tile_height)
+                    ).tobytes()
+                    tile_image_wrappers[y // tile_height, x // tile_width] = (
+                        TileImageWrapper(tile_image, self.atlas_image.mode)
+                    )
+            return tile_image_wrappers
+
+        # View the atlas as a (grid_height, grid_width, tile_height, tile_width, ...)
+        # tensor of tiles, so each tile is cut out by indexing, without copying the atlas.
+        atlas = self.atlas_pixels[: grid_height * tile_height, : grid_width * tile_width]
+        tiles = atlas.reshape(
+            grid_height, tile_height, grid_width, tile_width, *atlas.shape[2:]
+        ).swapaxes(1, 2)
+        mode = self.atlas_image.mode
+        transparency = None
+        if mode == "P":
+            transparency = self.atlas_image.info.get("transparency")
+        for tile_y in range(grid_height):
+            for tile_x in range(grid_width):
+                tile_image_wrappers[tile_y, tile_x] = TileImageWrapper(
+                    tiles[tile_y, tile_x].tobytes(), mode, transparency
+                )
 
         return tile_image_wrappers
 
-    @cached_property
+    @property
     def grid_size(self) -> tuple[int, int]:
-        """Get the grid size of the tileset."""
-        if not self.tile_size:
+        """Get the grid size of the tileset. It's computed whenever the tile size is set."""
+        if self._grid_size is None:
             raise ValueError("Tile size not set for the tileset.")
-        return (
-            self.atlas_image.width // self.tile_size[0],
-            self.atlas_image.height // self.tile_size[1],
-        )
+        return self._grid_size
 
     def tile_has_transparency(self, display: tuple[int, int]) -> bool:
         """Check if a tile has transparency."""
@@ -96,10 +124,12 @@ class Tileset:
     def tile_images(self) -> np.ndarray[tuple[int, int], Any]:
         """Get the tile images as a numpy array. The format of each image is bytes."""
 
-        tile_images = np.empty((self.grid_size[1], self.grid_size[0]), dtype=object)
-        for x in range(self.grid_size[0]):
-            for y in range(self.grid_size[1]):
-                tile_images[y, x] = self.tile_image_wrappers[y, x].image
+        grid_width, grid_height = self.grid_size
+        tile_image_wrappers = self.tile_image_wrappers
+        tile_images = np.empty((grid_height, grid_width), dtype=object)
+        for x in range(grid_width):
+            for y in range(grid_height):
+                tile_images[y, x] = tile_image_wrappers[y, x].image
         return tile_images
 
     def for_tile_image(self, callback: Callable[[bytes, int, int], None]):
@@ -110,8 +140,8 @@ class Tileset:
         - x: The x position of the tile image.
         - y: The y position of the tile image.
         """
-        for x in range(self.tile_images.shape[0]):
-            for y in range(self.tile_images.shape[1]):
-                byte_data = self.tile_images[x, y]
-                if byte_data:
-                    callback(byte_data, x, y)
+        tile_images = self.tile_images
+        # Empty tile images are skipped, so only the non-empty cells are visited.
+        xs, ys = np.nonzero(tile_images)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            callback(tile_images[x, y], x, y)
@@ -21,6 +21,8 @@ def order_pos(positions: tuple[tuple[int, int], tuple[int, int]]):
 
 
 class Line:
+    __slots__ = ("start", "end", "orientation")
+
     def __init__(
         self,
         positions: tuple[tuple[int, int], tuple[int, int]],
@@ -42,6 +44,8 @@ class Lines(TypedDict):
 
 
 class Node:
+    __slots__ = ("lines",)
+
     lines: Lines
 
     def __init__(self):
@@ -77,7 +81,9 @@ class TilemapBorderTracer:
 
     def _add_borders_to_tile(self, tile: Tile):
         """Executed when a tile is added. This function will check if the tile is a border tile and if it is, it will create lines in the tilemap border."""
-        neighbors = self.neighbor_processor.get_neighbors_bool_grid(tile)
+        neighbors = self.neighbor_processor.get_neighbors_bool_grid(
+            tile, out=self.neighbor_processor.scratch_bool_grid()
+        )
         if tile.position is None:
             return
 
@@ -2,6 +2,7 @@ from .rotate_matrix import rotate_matrix
 from .directional_grid_size_changing import (
     expand_grid_towards,
     reduce_grid_towards,
+    resize_grid,
 )
 from .direction import Direction, direction_vectors, opposite_directions
 
@@ -9,6 +10,7 @@ __all__ = [
     "rotate_matrix",
     "expand_grid_towards",
     "reduce_grid_towards",
+    "resize_grid",
     "Direction",
     "direction_vectors",
     "opposite_directions",
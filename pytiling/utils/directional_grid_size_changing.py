@@ -22,34 +22,35 @@ def expand_grid_towards(
         np.ndarray: The expanded grid.
     """
 
+    height, width = grid.shape
+
     def _create_new_grid(
-        pad_width: tuple[tuple[int, int], tuple[int, int]], grid=grid, fill=fill
+        shape: tuple[int, int],
+        old_block: tuple[slice, slice],
+        new_strip: tuple[slice, slice],
     ) -> np.ndarray:
-        new_grid = np.pad(grid, pad_width, mode="constant", constant_values=0)
-
-        if direction == "left":
-            new_grid[:, :size] = fill
-        elif direction == "right":
-            new_grid[:, -size:] = fill
-        elif direction == "top":
-            new_grid[:size, :] = fill
-        elif direction == "bottom":
-            new_grid[-size:, :] = fill
-
+        # Every cell is written exactly once: either copied from the old grid or filled.
+        new_grid = np.empty(shape, dtype=grid.dtype)
+        new_grid[old_block] = grid
+        new_grid[new_strip] = fill
         return new_grid
 
     if direction == "left":
-        return _create_new_grid(((0, 0), (size, 0)))
+        return _create_new_grid(
+            (height, width + size), np.s_[:, size:], np.s_[:, :size]
+        )
     elif direction == "right":
-        return _create_new_grid(((0, 0), (0, size)))
+        return _create_new_grid(
+            (height, width + size), np.s_[:, :width], np.s_[:, width:]
+        )
     elif direction == "top":  # Should add rows at the end
-        return _create_new_grid(((size, 0), (0, 0)))
+        return _create_new_grid(
+            (height + size, width), np.s_[size:, :], np.s_[:size, :]
+        )
     elif direction == "bottom":  # Should add rows at the beginning
-        return _create_new_grid(((0, size), (0, 0)))
-    # elif direction == "top":
-    #     return _create_new_grid(((size, 0), (0, 0)))
-    # elif direction == "bottom":
-    #     return _create_new_grid(((0, size), (0, 0)))
+        return _create_new_grid(
+            (height + size, width), np.s_[:height, :], np.s_[height:, :]
+        )
 
 
 def reduce_grid_towards(grid: np.ndarray, direction: Direction, size=1):
@@ -72,3 +73,23 @@ def reduce_grid_towards(grid: np.ndarray, direction: Direction, size=1):
         return grid[size:, :]
     elif direction == "bottom":
         return grid[:-size, :]
+
+
+def resize_grid(grid: np.ndarray, size: tuple[int, int], fill=None) -> np.ndarray:
+    """
+    Resize the grid, keeping every cell at its position.
+
+    Parameters:
+        grid: The input grid.
+        size: The new size, as (width, height).
+        fill: The value to fill the new cells with.
+
+    Returns:
+        np.ndarray: A new grid of the same dtype. The overlapping top-left block is copied, cells beyond the new size are dropped and new cells hold the fill value.
+    """
+    width, height = size
+    new_grid = np.full((height, width), fill, dtype=grid.dtype)
+    kept_height = min(height, grid.shape[0])
+    kept_width = min(width, grid.shape[1])
+    new_grid[:kept_height, :kept_width] = grid[:kept_height, :kept_width]
+    return new_grid
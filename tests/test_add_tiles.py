@@ -0,0 +1,88 @@
+"""Tests for adding many tiles to a TilemapLayer at once."""
+
+from pathlib import Path
+
+import pytest
+
+from pytiling import AutotileTile, Tile, Tilemap, TilemapLayer, Tileset
+
+ASSETS = Path(__file__).resolve().parents[2] / "assets" / "img" / "tilesets" / "dungeon"
+
+POSITIONS = [(1, 1), (2, 1), (3, 1), (1, 2), (2, 2), (3, 2), (5, 4), (6, 4)]
+
+
+def _make_layer(width: int = 8, height: int = 6) -> TilemapLayer:
+    tilemap = Tilemap((16, 16), (width, height), (1, 1), (64, 64))
+    layer = TilemapLayer("platforms", Tileset(str(ASSETS / "platforms.png")))
+    tilemap.add_layer(layer)
+    return layer
+
+
+def test_add_tiles_formats_like_adding_one_by_one():
+    one_by_one = _make_layer()
+    for position in POSITIONS:
+        one_by_one.create_autotile_tile_at(position, "platform", apply_formatting=True)
+    one_by_one.create_tile_at((0, 5), (1, 1), "decoration", apply_formatting=True)
+
+    batched = _make_layer()
+    tiles = [AutotileTile(position, "platform") for position in POSITIONS]
+    tiles.append(Tile((0, 5), (1, 1), "decoration"))
+    added = batched.add_tiles(tiles, apply_formatting=True)
+
+    assert added == tiles
+    for tile in one_by_one.tiles:
+        assert batched.get_tile_at(tile.position).display == tile.display
+
+
+def test_add_tiles_checks_every_position_before_adding():
+    layer = _make_layer()
+    tiles = [AutotileTile((0, 0), "platform"), AutotileTile((8, 0), "platform")]
+
+    with pytest.raises(ValueError):
+        layer.add_tiles(tiles)
+
+    assert layer.get_tile_at((0, 0)) is None
+
+
+def test_add_tiles_leaves_tiles_between_far_apart_ones_alone():
+    layer = _make_layer(16, 6)
+    middle = layer.create_autotile_tile_at((8, 3), "platform")
+    formatted = []
+    middle.events["post_autotile"].connect(
+        lambda sender, tile: formatted.append(tile), weak=False
+    )
+
+    layer.add_tiles(
+        [AutotileTile((0, 0), "platform"), AutotileTile((15, 5), "platform")],
+        apply_formatting=True,
+    )
+
+    assert formatted == []
+    # Both added tiles were formatted, so formatting them again changes nothing.
+    assert not layer.get_tile_at((0, 0)).format()
+    assert not layer.get_tile_at((15, 5)).format()
+
+
+def test_add_tiles_accepts_a_generator():
+    layer = _make_layer()
+
+    added = layer.add_tiles(
+        (AutotileTile(position, "platform") for position in POSITIONS),
+        apply_formatting=True,
+    )
+
+    assert [tile.position for tile in added] == POSITIONS
+    assert sorted(tile.position for tile in layer.tiles) == sorted(POSITIONS)
+
+
+def test_add_tiles_does_not_reformat_around_plain_tiles():
+    layer = _make_layer()
+    neighbor = layer.create_autotile_tile_at((2, 2), "platform")
+    formatted = []
+    neighbor.events["post_autotile"].connect(
+        lambda sender, tile: formatted.append(tile), weak=False
+    )
+
+    layer.add_tiles([Tile((3, 2), (1, 1), "decoration")], apply_formatting=True)
+
+    assert formatted == []
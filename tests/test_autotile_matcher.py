@@ -0,0 +1,142 @@
+"""Tests for the vectorized autotile rule matcher."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pytiling import AutotileTile, Tilemap, TilemapLayer, Tileset
+from pytiling.grid_element.tile.autotile.autotile_matcher import (
+    build_rule_table,
+    match_rules,
+    neighbor_bits_grid,
+)
+from pytiling.layer.tilemap_layer.tilemap_layer_neighbor_processor import (
+    TilemapLayerNeighborProcessor,
+)
+from pytiling.grid_element.tile.autotile.default_rules import (
+    get_detailed_default_autotile_rules,
+)
+
+ASSETS = Path(__file__).resolve().parents[2] / "assets" / "img" / "tilesets" / "dungeon"
+
+
+def _neighborhood(mask: int):
+    cells = [bool(mask >> bit & 1) for bit in range(8)]
+    cells.insert(4, False)
+    return np.array(cells).reshape(3, 3)
+
+
+def test_batch_match_agrees_with_single_tile_match():
+    rules = get_detailed_default_autotile_rules()
+    bits = np.arange(256, dtype=np.uint8)
+
+    matched = match_rules(bits, build_rule_table(tuple(rules))).tolist()
+
+    for mask, display in enumerate(matched):
+        grid = _neighborhood(mask)
+        expected = next((rule.display for rule in rules if rule.matches(grid)), (0, 0))
+        assert tuple(display) == expected
+        assert AutotileTile.display_from_neighbor_grid(grid, rules) == expected
+        assert AutotileTile.display_from_neighbor_mask(mask, rules) == expected
+
+
+def test_neighbor_bits_count_out_of_grid_as_neighbors():
+    occupied = np.zeros((3, 3), dtype=bool)
+    occupied[1, 1] = True
+
+    bits = neighbor_bits_grid(occupied)
+
+    assert bits[1, 1] == 0
+    # Top-left corner: right and bottom neighbors are empty, the diagonal one is occupied.
+    assert bits[0, 0] == 0b1010_1111
+    # Top edge middle: the row above is out of the grid, the center below is occupied.
+    assert bits[0, 1] == 0b0100_0111
+
+
+def test_format_area_agrees_with_formatting_each_tile():
+    tilemap = Tilemap((16, 16), (7, 6), (1, 1), (64, 64))
+    layer = TilemapLayer("platforms", Tileset(str(ASSETS / "platforms.png")))
+    tilemap.add_layer(layer)
+    occupied = [(x, y) for x in range(7) for y in range(6) if (x * 3 + y * 5) % 7 < 5]
+    for position in occupied:
+        layer.create_autotile_tile_at(position, "platform")
+
+    # An area touching the left edge but not the right one, so both kinds of border show up.
+    layer.formatter.format_area(layer.clip_area(0, 1, 4, 4))
+    batch_displays = {tile.position: tile.display for tile in layer.tiles}
+
+    for tile in layer.tiles:
+        x, y = tile.position
+        if x <= 4 and 1 <= y <= 4:
+            tile.format()
+    assert {tile.position: tile.display for tile in layer.tiles} == batch_displays
+    assert any(display != (0, 0) for display in batch_displays.values())
+
+
+def _two_object_layer(same_autotile_object: bool) -> TilemapLayer:
+    """A layer where platform and rock autotiles touch each other."""
+    tilemap = Tilemap((16, 16), (7, 6), (1, 1), (64, 64))
+    layer = TilemapLayer("platforms", Tileset(str(ASSETS / "platforms.png")))
+    tilemap.add_layer(layer)
+    layer.autotile_neighbor_processor.same_autotile_object = same_autotile_object
+    for x in range(7):
+        for y in range(6):
+            if (x * 3 + y * 5) % 7 < 5:
+                layer.create_autotile_tile_at((x, y), "platform" if x < 4 else "rock")
+    return layer
+
+
+def _format_each_tile(layer: TilemapLayer) -> dict:
+    for tile in layer.tiles:
+        tile.format()
+    return {tile.position: tile.display for tile in layer.tiles}
+
+
+@pytest.mark.parametrize("same_autotile_object", [False, True])
+def test_format_all_tiles_agrees_with_formatting_each_tile(same_autotile_object):
+    layer = _two_object_layer(same_autotile_object)
+
+    layer.formatter.format_all_tiles()
+    batch_displays = {tile.position: tile.display for tile in layer.tiles}
+
+    assert _format_each_tile(layer) == batch_displays
+
+
+@pytest.mark.parametrize("same_autotile_object", [False, True])
+def test_live_edits_agree_with_formatting_each_tile(same_autotile_object):
+    layer = _two_object_layer(same_autotile_object)
+    layer.formatter.format_all_tiles()
+
+    layer.create_autotile_tile_at((3, 2), "rock", apply_formatting=True)
+    layer.create_autotile_tile_at((4, 0), "platform", apply_formatting=True)
+    layer.remove_tile_at((2, 3), apply_formatting=True)
+    edited_displays = {tile.position: tile.display for tile in layer.tiles}
+
+    assert _format_each_tile(layer) == edited_displays
+
+
+def test_format_with_four_adjacency_matches_its_bool_grid():
+    layer = _two_object_layer(same_autotile_object=False)
+    processor = TilemapLayerNeighborProcessor(layer, adjancecy_rule="four")
+    layer.autotile_neighbor_processor = processor
+    rules = layer.autotile_rules["default"]
+
+    for tile in layer.tiles:
+        tile.format()
+        grid = processor.get_neighbors_bool_grid(tile)
+        assert tile.display == AutotileTile.display_from_neighbor_grid(grid, rules)
+
+
+def test_layer_formatting_with_four_adjacency_agrees_with_each_tile():
+    layer = _two_object_layer(same_autotile_object=False)
+    layer.autotile_neighbor_processor = TilemapLayerNeighborProcessor(
+        layer, adjancecy_rule="four"
+    )
+
+    layer.formatter.format_all_tiles()
+    layer.formatter.format_area(layer.clip_area(0, 1, 4, 4))
+    layer.create_autotile_tile_at((3, 2), "rock", apply_formatting=True)
+    displays = {tile.position: tile.display for tile in layer.tiles}
+
+    assert _format_each_tile(layer) == displays
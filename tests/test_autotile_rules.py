@@ -0,0 +1,45 @@
+"""Tests for the autotile rules a TilemapLayer hands out to its autotile objects."""
+
+from pathlib import Path
+
+from pytiling import AutotileRule, Tilemap, TilemapLayer, Tileset
+from pytiling.grid_element.tile.autotile.default_rules import (
+    get_detailed_default_autotile_rules,
+)
+
+ASSETS = Path(__file__).resolve().parents[2] / "assets" / "img" / "tilesets" / "dungeon"
+
+
+def _make_layer(name: str) -> TilemapLayer:
+    tilemap = Tilemap((16, 16), (6, 5), (1, 1), (64, 64))
+    layer = TilemapLayer(name, Tileset(str(ASSETS / "platforms.png")))
+    tilemap.add_layer(layer)
+    return layer
+
+
+def test_object_rules_do_not_alias_the_default_rules():
+    shared_defaults = list(get_detailed_default_autotile_rules())
+    layer = _make_layer("platforms")
+    other_layer = _make_layer("walls")
+    layer.create_autotile_tile_at((0, 0), "platform")
+    layer.create_autotile_tile_at((2, 2), "rock")
+
+    extra_rule = AutotileRule([[2, 2, 2], [2, 1, 2], [2, 2, 2]], (5, 5))
+    layer.add_autotile_rule("platform", extra_rule)
+
+    assert layer.autotile_rules["platform"][-1] is extra_rule
+    assert extra_rule not in layer.autotile_rules["rock"]
+    assert extra_rule not in layer.autotile_rules["default"]
+    assert extra_rule not in other_layer.autotile_rules["default"]
+    assert get_detailed_default_autotile_rules() == shared_defaults
+
+
+def test_default_rules_are_not_shared_between_layers():
+    layer = _make_layer("platforms")
+    other_layer = _make_layer("walls")
+
+    extra_rule = AutotileRule([[2, 2, 2], [2, 1, 2], [2, 2, 2]], (5, 5))
+    layer.add_autotile_rule("default", extra_rule)
+
+    assert extra_rule not in other_layer.autotile_rules["default"]
+    assert extra_rule not in get_detailed_default_autotile_rules()
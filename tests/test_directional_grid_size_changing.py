@@ -0,0 +1,38 @@
+"""Tests for growing and shrinking grids towards a direction."""
+
+import numpy as np
+import pytest
+
+from pytiling.utils import expand_grid_towards, reduce_grid_towards
+
+# Where a 3x4 grid ends up after growing by 2 towards each direction.
+OLD_BLOCK = {
+    "left": (slice(0, 3), slice(2, 6)),
+    "right": (slice(0, 3), slice(0, 4)),
+    "top": (slice(2, 5), slice(0, 4)),
+    "bottom": (slice(0, 3), slice(0, 4)),
+}
+
+
+@pytest.mark.parametrize("direction", list(OLD_BLOCK))
+def test_expand_fills_only_the_new_strip(direction):
+    grid = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+    expanded = expand_grid_towards(grid, direction, 2, fill=-1)
+
+    new_cells = np.ones(expanded.shape, dtype=bool)
+    new_cells[OLD_BLOCK[direction]] = False
+    vertical = direction in ("top", "bottom")
+    assert expanded.shape == ((5, 4) if vertical else (3, 6))
+    assert expanded.dtype == grid.dtype
+    assert (expanded[OLD_BLOCK[direction]] == grid).all()
+    assert (expanded[new_cells] == -1).all()
+
+
+@pytest.mark.parametrize("direction", list(OLD_BLOCK))
+def test_reduce_undoes_expand(direction):
+    grid = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+    expanded = expand_grid_towards(grid, direction, 2, fill=-1)
+
+    assert (reduce_grid_towards(expanded, direction, 2) == grid).all()
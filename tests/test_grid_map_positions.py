@@ -0,0 +1,45 @@
+"""Tests for converting between grid positions and window positions."""
+
+import itertools
+
+import pytest
+
+from pytiling import GridMap
+
+
+@pytest.mark.parametrize(
+    "invert_x_axis, invert_y_axis", list(itertools.product([False, True], repeat=2))
+)
+def test_batch_conversion_matches_single_conversion(invert_x_axis, invert_y_axis):
+    grid_map = GridMap((16, 8), (6, 5), (1, 1), (64, 64))
+    positions = [(x, y) for x in range(-1, 7) for y in range(-1, 6)]
+
+    batch = grid_map.grid_pos_to_actual_pos_batch(
+        positions, invert_x_axis, invert_y_axis
+    )
+
+    assert batch.shape == (len(positions), 2)
+    for position, actual_position in zip(positions, batch.tolist()):
+        assert tuple(actual_position) == grid_map.grid_pos_to_actual_pos(
+            position, invert_x_axis, invert_y_axis
+        )
+
+
+@pytest.mark.parametrize(
+    "invert_x_axis, invert_y_axis", list(itertools.product([False, True], repeat=2))
+)
+def test_inverse_batch_conversion_matches_single_conversion(
+    invert_x_axis, invert_y_axis
+):
+    grid_map = GridMap((16, 8), (6, 5), (1, 1), (64, 64))
+    positions = [(x * 5.5, y * 3.25) for x in range(-2, 20) for y in range(-2, 14)]
+
+    batch = grid_map.actual_pos_to_grid_pos_batch(
+        positions, invert_x_axis, invert_y_axis
+    )
+
+    assert batch.shape == (len(positions), 2)
+    for position, grid_position in zip(positions, batch.tolist()):
+        assert tuple(grid_position) == grid_map.actual_pos_to_grid_pos(
+            position, invert_x_axis, invert_y_axis
+        )
@@ -0,0 +1,51 @@
+"""Tests for resizing a grid map and its layers."""
+
+import numpy as np
+
+from pytiling import GridElement, GridLayer, GridMap
+from pytiling.utils import resize_grid
+
+
+def _make_layer(width: int = 4, height: int = 3) -> GridLayer:
+    grid_map = GridMap((16, 16), (width, height), (1, 1), (64, 64))
+    layer = GridLayer("test")
+    grid_map.add_layer(layer)
+    return layer
+
+
+def test_resize_keeps_elements_in_place():
+    layer = _make_layer()
+    element = GridElement((3, 2), name="goal")
+    layer.add_element(element)
+
+    layer.grid_map.resize((6, 5))
+
+    assert layer.grid_size == (6, 5)
+    assert layer.get_element_at((3, 2)) is element
+    assert layer.elements == [element]
+
+
+def test_resize_drops_cropped_cells():
+    layer = _make_layer()
+    kept = GridElement((1, 1), name="kept")
+    cropped = GridElement((3, 2), name="cropped")
+    layer.add_element(kept)
+    layer.add_element(cropped)
+
+    layer.grid_map.resize((2, 2))
+
+    assert layer.grid_size == (2, 2)
+    assert layer.elements == [kept]
+
+
+def test_resize_grid_copies_overlap_and_fills_new_cells():
+    grid = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+    grown = resize_grid(grid, (5, 4), fill=-1)
+    shrunk = resize_grid(grid, (2, 2), fill=-1)
+
+    assert grown.dtype == np.int32
+    assert grown.shape == (4, 5)
+    assert (grown[:3, :4] == grid).all()
+    assert (grown[3, :] == -1).all() and (grown[:, 4] == -1).all()
+    assert (shrunk == grid[:2, :2]).all()
@@ -0,0 +1,31 @@
+"""Tests for making grid map layers concurrent."""
+
+from pytiling import GridLayer, GridMap
+
+
+def _make_map(*layer_names: str) -> GridMap:
+    grid_map = GridMap((16, 16), (4, 3), (1, 1), (64, 64))
+    for name in layer_names:
+        grid_map.add_layer(GridLayer(name))
+    return grid_map
+
+
+def test_layer_concurrence_pairs_every_layer_with_the_others():
+    grid_map = _make_map("platforms", "essentials", "decoration")
+
+    grid_map.add_layer_concurrence("platforms", "essentials", "decoration")
+
+    for layer in grid_map.layers:
+        others = {other for other in grid_map.layers if other is not layer}
+        assert layer.concurrent_layers == others
+
+
+def test_layer_named_twice_is_not_concurrent_with_itself():
+    grid_map = _make_map("platforms", "essentials")
+    platforms = grid_map.get_layer("platforms")
+    essentials = grid_map.get_layer("essentials")
+
+    grid_map.add_layer_concurrence("platforms", "essentials", "platforms")
+
+    assert platforms.concurrent_layers == {essentials}
+    assert essentials.concurrent_layers == {platforms}
@@ -0,0 +1,48 @@
+"""Tests for querying the tiles under a window rectangle."""
+
+from pathlib import Path
+
+from pytiling import Tilemap, TilemapLayer, Tileset
+
+ASSETS = Path(__file__).resolve().parents[2] / "assets" / "img" / "tilesets" / "dungeon"
+
+
+def _make_tilemap() -> tuple[Tilemap, TilemapLayer, TilemapLayer]:
+    tilemap = Tilemap((16, 16), (10, 8), (1, 1), (64, 64))
+    ground = TilemapLayer("ground", Tileset(str(ASSETS / "platforms.png")))
+    decoration = TilemapLayer("decoration", Tileset(str(ASSETS / "platforms.png")))
+    tilemap.add_layer(ground)
+    tilemap.add_layer(decoration)
+    return tilemap, ground, decoration
+
+
+def test_query_visible_returns_tiles_under_the_rectangle():
+    tilemap, ground, decoration = _make_tilemap()
+    inside = [
+        ground.create_autotile_tile_at((2, 1), "platform"),
+        ground.create_autotile_tile_at((4, 3), "platform"),
+        decoration.create_tile_at((3, 2), (1, 1), "flower"),
+    ]
+    ground.create_autotile_tile_at((5, 3), "platform")
+    ground.create_autotile_tile_at((2, 4), "platform")
+
+    # Cells x 2..4 and y 1..3: the map is 128px high and y grows downwards on the grid.
+    visible = list(tilemap.query_visible((33, 81, 46, 46)))
+
+    assert visible == inside
+
+
+def test_query_visible_outside_the_map_is_empty():
+    tilemap, ground, _ = _make_tilemap()
+    ground.create_autotile_tile_at((0, 0), "platform")
+
+    assert list(tilemap.query_visible((-500, -500, 100, 100))) == []
+    assert list(tilemap.query_visible((1000, 1000, 100, 100))) == []
+
+
+def test_clip_area_keeps_inclusive_bounds_inside_the_grid():
+    _, ground, _ = _make_tilemap()
+
+    assert ground.clip_area(-3, 2, 4, 20) == (0, 2, 4, 7)
+    assert ground.clip_area(2, 1, 9, 7) == (2, 1, 9, 7)
+    assert ground.get_tiles_in_area(ground.clip_area(20, 20, 30, 30)) == []
@@ -0,0 +1,55 @@
+"""Tests for reading tile transparency from raw tile bytes."""
+
+import numpy as np
+from PIL import Image
+
+from pytiling import Tileset
+from pytiling.tileset.tile_image_wrapper import TileImageWrapper
+
+
+def _rgba_tile(alpha: int) -> bytes:
+    pixels = np.full((4, 4, 4), 200, dtype=np.uint8)
+    pixels[..., 3] = 255
+    pixels[1, 2, 3] = alpha
+    return pixels.tobytes()
+
+
+def test_rgba_transparency():
+    assert TileImageWrapper(_rgba_tile(0), "RGBA").has_transparency
+    assert TileImageWrapper(_rgba_tile(254), "RGBA").has_transparency
+    assert not TileImageWrapper(_rgba_tile(255), "RGBA").has_transparency
+
+
+def test_la_and_opaque_modes():
+    assert TileImageWrapper(bytes([10, 255, 20, 128]), "LA").has_transparency
+    assert not TileImageWrapper(bytes([10, 255, 20, 255]), "LA").has_transparency
+    assert not TileImageWrapper(bytes([0, 0, 0] * 4), "RGB").has_transparency
+
+
+def test_palette_transparency():
+    indexes = bytes([0, 1, 2, 1])
+    assert TileImageWrapper(indexes, "P", transparency=2).has_transparency
+    assert not TileImageWrapper(indexes, "P", transparency=3).has_transparency
+    assert TileImageWrapper(indexes, "P", transparency=b"\xff\x80").has_transparency
+    assert not TileImageWrapper(indexes, "P", transparency=b"\xff\xff").has_transparency
+    assert not TileImageWrapper(indexes, "P").has_transparency
+
+
+def test_tileset_reports_transparent_tiles(tmp_path):
+    pixels = np.full((8, 16, 4), 255, dtype=np.uint8)
+    pixels[2, 11, 3] = 0  # Inside the second tile of the first row.
+    path = tmp_path / "atlas.png"
+    Image.fromarray(pixels, "RGBA").save(path)
+
+    tileset = Tileset(str(path))
+    tileset.tile_size = (8, 8)
+
+    assert not tileset.tile_has_transparency((0, 0))
+    assert tileset.tile_has_transparency((1, 0))
+
+
+def test_same_bytes_are_read_according_to_their_mode():
+    image = bytes([10, 128, 20, 255])
+
+    assert TileImageWrapper(image, "LA").has_transparency
+    assert not TileImageWrapper(image, "RGBA").has_transparency
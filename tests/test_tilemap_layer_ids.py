@@ -0,0 +1,179 @@
+"""Tests for the integer id grids a TilemapLayer keeps next to its object grid."""
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pytiling import AutotileTile, GridLayer, Tilemap, TilemapLayer, Tileset
+from pytiling.layer.tilemap_layer import tilemap_layer as tilemap_layer_module
+from pytiling.layer.tilemap_layer.tilemap_layer_neighbor_processor import (
+    TilemapLayerNeighborProcessor,
+)
+
+ASSETS = Path(__file__).resolve().parents[2] / "assets" / "img" / "tilesets" / "dungeon"
+
+
+def _make_layer(width: int = 6, height: int = 5) -> TilemapLayer:
+    tilemap = Tilemap((16, 16), (width, height), (1, 1), (64, 64))
+    layer = TilemapLayer("platforms", Tileset(str(ASSETS / "platforms.png")))
+    tilemap.add_layer(layer)
+    return layer
+
+
+def _populate(layer: TilemapLayer):
+    layer.create_autotile_tile_at((0, 0), "platform")
+    layer.create_autotile_tile_at((1, 0), "platform")
+    layer.create_autotile_tile_at((4, 3), "rock")
+    layer.create_tile_at((2, 2), (1, 1), "decoration")
+    layer.create_tile_at((5, 4), (1, 1), "decoration")
+
+
+def _assert_ids_match_grid(layer: TilemapLayer):
+    assert layer.tile_ids.shape == layer.grid.shape
+    assert layer.autotile_ids.shape == layer.grid.shape
+    for (y, x), element in np.ndenumerate(layer.grid):
+        if element is None:
+            assert layer.tile_ids[y, x] == -1
+            assert layer.autotile_ids[y, x] == -1
+            continue
+        name_id = layer.name_id(element.name)
+        assert layer.tile_ids[y, x] == name_id
+        expected_autotile_id = name_id if isinstance(element, AutotileTile) else -1
+        assert layer.autotile_ids[y, x] == expected_autotile_id
+
+
+def test_ids_follow_added_and_removed_tiles():
+    layer = _make_layer()
+    _populate(layer)
+    _assert_ids_match_grid(layer)
+    assert layer.tile_ids[0, 0] == layer.autotile_ids[0, 0]
+    assert layer.autotile_ids[2, 2] == -1
+
+    layer.remove_tile_at((1, 0))
+    layer.create_tile_at((0, 0), (1, 1), "decoration")
+    _assert_ids_match_grid(layer)
+
+
+@pytest.mark.parametrize("direction", ["left", "right", "top", "bottom"])
+def test_ids_follow_grid_expansion_and_reduction(direction):
+    layer = _make_layer()
+    _populate(layer)
+
+    layer.grid_map.expand_towards(direction, 2)
+    _assert_ids_match_grid(layer)
+
+    layer.grid_map.reduce_towards(direction, 3)
+    _assert_ids_match_grid(layer)
+
+
+def test_ids_follow_resize():
+    layer = _make_layer()
+    _populate(layer)
+
+    layer.grid_map.resize((8, 3))
+    _assert_ids_match_grid(layer)
+    assert layer.tile_ids[0, 0] == layer.name_id("platform")
+
+
+def test_id_grids_keep_their_dtypes():
+    layer = _make_layer()
+    _populate(layer)
+
+    layer.grid_map.expand_towards("left", 2)
+    layer.grid_map.resize((9, 9))
+
+    assert layer.tile_ids.dtype == np.int32
+    assert layer.autotile_ids.dtype == np.int16
+
+
+@pytest.mark.parametrize("same_autotile_object", [False, True])
+def test_neighbors_mask_matches_bool_grid(same_autotile_object):
+    layer = _make_layer()
+    _populate(layer)
+    processor = TilemapLayerNeighborProcessor(
+        layer, same_autotile_object=same_autotile_object
+    )
+
+    for tile in layer.elements:
+        grid = processor.get_neighbors_bool_grid(tile)
+        expected = np.delete(grid.ravel(), 4)
+        mask = processor.get_neighbors_mask(tile)
+        assert [bool(mask >> bit & 1) for bit in range(8)] == expected.tolist()
+        assert processor.get_amount_of_neighbors_of(tile) == int(expected.sum())
+
+
+@pytest.mark.parametrize("adjacency_rule", ["eight", "four"])
+def test_neighbor_queries_do_not_intern_unknown_names(adjacency_rule):
+    layer = _make_layer()
+    _populate(layer)
+    processor = TilemapLayerNeighborProcessor(
+        layer, adjacency_rule, same_autotile_object=True
+    )
+    stranger = AutotileTile((1, 1), "stranger")
+
+    neighbors = processor.get_neighbors_bool_grid(stranger)
+    processor.get_amount_of_neighbors_of(stranger)
+    if adjacency_rule == "eight":
+        processor.get_neighbors_mask(stranger)
+
+    assert not neighbors.any()
+    assert layer.find_name_id("stranger") is None
+
+
+@pytest.mark.parametrize("adjacency_rule", ["eight", "four"])
+def test_neighbors_bool_grid_into_scratch_buffer(adjacency_rule):
+    layer = _make_layer()
+    _populate(layer)
+    processor = TilemapLayerNeighborProcessor(layer, adjacency_rule)
+    scratch = processor.scratch_bool_grid()
+
+    for tile in layer.elements:
+        neighbors = processor.get_neighbors_bool_grid(tile, out=scratch)
+        assert neighbors is scratch
+        assert (neighbors == processor.get_neighbors_bool_grid(tile)).all()
+    assert processor.scratch_bool_grid() is scratch
+
+
+def test_name_ids_are_capped_to_what_autotile_ids_can_hold(monkeypatch):
+    monkeypatch.setattr(tilemap_layer_module, "MAX_NAME_ID", 2)
+    layer = _make_layer()
+    for name in ("a", "b", "c"):
+        layer.name_id(name)
+
+    assert layer.name_id("a") == 0
+    with pytest.raises(ValueError):
+        layer.name_id("d")
+
+
+def test_name_for_id_reverses_name_id():
+    layer = _make_layer()
+    _populate(layer)
+
+    for name in ("platform", "rock", "decoration"):
+        assert layer.name_for_id(layer.name_id(name)) == name
+    with pytest.raises(KeyError):
+        layer.name_for_id(3)
+    with pytest.raises(KeyError):
+        layer.name_for_id(-1)
+
+
+def test_layers_pickled_without_id_grids_rebuild_them(monkeypatch):
+    layer = _make_layer()
+    _populate(layer)
+
+    def old_getstate(self):
+        state = GridLayer.__getstate__(self)
+        for key in ("_name_ids", "_names", "tile_ids", "autotile_ids"):
+            state.pop(key)
+        return state
+
+    with monkeypatch.context() as patch:
+        patch.setattr(TilemapLayer, "__getstate__", old_getstate)
+        data = pickle.dumps(layer)
+    restored = pickle.loads(data)
+
+    _assert_ids_match_grid(restored)
+    restored.create_autotile_tile_at((3, 3), "platform", apply_formatting=True)
+    _assert_ids_match_grid(restored)
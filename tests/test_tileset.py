@@ -0,0 +1,47 @@
+"""Tests for cutting a tileset atlas into tiles."""
+
+from pathlib import Path
+
+from pytiling import Tilemap, TilemapLayer, Tileset
+
+ASSETS = Path(__file__).resolve().parents[2] / "assets" / "img" / "tilesets" / "dungeon"
+
+
+def test_tileset_shared_by_layers_is_cut_once():
+    tileset = Tileset(str(ASSETS / "platforms.png"))
+    tilemap = Tilemap((16, 16), (6, 5), (1, 1), (64, 64))
+    tilemap.add_layer(TilemapLayer("platforms", tileset))
+    wrappers = tileset.tile_image_wrappers
+
+    tilemap.add_layer(TilemapLayer("background", tileset))
+
+    assert tileset.tile_image_wrappers is wrappers
+    assert tilemap.tilesets == [tileset]
+
+
+def test_tileset_recut_when_tile_size_changes():
+    tileset = Tileset(str(ASSETS / "platforms.png"))
+    tileset.tile_size = (16, 16)
+    tile_images = tileset.tile_images
+
+    tileset.tile_size = (8, 8)
+
+    width, height = tileset.atlas_image.size
+    assert tileset.grid_size == (width // 8, height // 8)
+    assert tileset.tile_image_wrappers.shape == (height // 8, width // 8)
+    assert tileset.tile_images is not tile_images
+    assert len(tileset.tile_images[0, 0]) * 4 == len(tile_images[0, 0])
+
+
+def test_for_tile_image_skips_empty_tiles():
+    tileset = Tileset(str(ASSETS / "platforms.png"))
+    tileset.tile_size = (16, 16)
+    tileset.tile_images[0, 1] = b""
+
+    visited = []
+    tileset.for_tile_image(lambda byte_data, x, y: visited.append((x, y)))
+
+    rows, columns = tileset.tile_images.shape
+    expected = [(x, y) for x in range(rows) for y in range(columns)]
+    expected.remove((0, 1))
+    assert visited == expected